@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+AI Career Guidance System - Adaptive Quiz
+=========================================
+
+Asks quiz questions one at a time and stops as soon as the remaining answers
+can no longer change the top-k career ranking under the default ``l1``
+matching rule (mean ``1 - |user/5 - required|`` over a career's traits).
+
+Each career's final score is a sum of per-trait contributions, so the quiz
+tracks a lower and upper bound per career from the answered traits plus the
+best and worst case of every unanswered one. Careers whose bounds overlap are
+compared pairwise, where the worst case of the score difference is exact
+because it also decomposes per trait.
+
+Usage:
+    python adaptive_quiz.py [--users 2000] [--top-k 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+# The early-stop bounds only hold for this matching kernel
+ADAPTIVE_KERNEL = 'l1'
+ANSWER_VALUES = np.arange(1, 6)
+NEUTRAL_ANSWER = 3
+# Score gaps below this are treated as ties so float noise cannot end the quiz
+TIE_EPSILON = 1e-9
+
+
+class AdaptiveQuiz:
+    """Adaptive question ordering with early stopping for one user"""
+
+    def __init__(self, catalog, k=3):
+        self.traits = list(catalog.traits)
+        self.careers = list(catalog.career_names)
+        self.k = min(k, len(self.careers))
+        levels, mask = catalog.levels, catalog.mask
+        counts = mask.sum(axis=1, keepdims=True)
+        weights = np.divide(mask, counts, out=np.zeros_like(mask), where=counts > 0)
+        # contributions[c, t, a]: what answering ANSWER_VALUES[a] on trait t adds to career c
+        gap = np.abs(ANSWER_VALUES[None, None, :] / 5.0 - levels[:, :, None])
+        self.contributions = weights[:, :, None] * (1.0 - gap)
+        self.best = self.contributions.max(axis=2)
+        self.worst = self.contributions.min(axis=2)
+        self.answers = {}
+        self.answered = np.zeros(len(self.traits), dtype=bool)
+        self.current = np.zeros(len(self.careers))
+
+    def answer(self, trait, score):
+        """Record a 1-5 answer for a trait"""
+        t = self.traits.index(trait)
+        if self.answered[t]:
+            self.current -= self.contributions[:, t, self.answers[trait] - 1]
+        self.answers[trait] = int(score)
+        self.answered[t] = True
+        self.current += self.contributions[:, t, int(score) - 1]
+
+    def bounds(self):
+        """Lower and upper bound of every career's final score"""
+        open_ = ~self.answered
+        lower = self.current + self.worst[:, open_].sum(axis=1)
+        upper = self.current + self.best[:, open_].sum(axis=1)
+        return lower, upper
+
+    def _min_difference(self, a, b):
+        # Exact worst case of score[a] - score[b] over all remaining answers
+        open_ = ~self.answered
+        diff = self.contributions[a, open_, :] - self.contributions[b, open_, :]
+        return self.current[a] - self.current[b] + diff.min(axis=1).sum()
+
+    def ranking(self):
+        """Careers ordered by the midpoint of their score bounds"""
+        lower, upper = self.bounds()
+        return [self.careers[i] for i in np.argsort(-(lower + upper), kind='stable')]
+
+    def is_decided(self):
+        """True once no remaining answers can change the top-k ranking"""
+        lower, upper = self.bounds()
+        order = np.argsort(-(lower + upper), kind='stable')
+        for i in range(self.k):
+            a = order[i]
+            for b in order[i + 1:]:
+                if lower[a] > upper[b] + TIE_EPSILON:
+                    continue
+                if self._min_difference(a, b) <= TIE_EPSILON:
+                    return False
+        return True
+
+    def _contested(self):
+        lower, upper = self.bounds()
+        kth_lower = np.sort(lower)[::-1][self.k - 1]
+        return np.flatnonzero(upper >= kth_lower)
+
+    def next_trait(self):
+        """Most discriminating unanswered trait, or None when the quiz can stop"""
+        if self.answered.all() or self.is_decided():
+            return None
+        contested = self._contested()
+        open_ = np.flatnonzero(~self.answered)
+        # How far each open trait can swing the gap between contested careers
+        block = self.contributions[np.ix_(contested, open_)]
+        pairwise = block[:, None, :, :] - block[None, :, :, :]
+        power = (pairwise.max(axis=3) - pairwise.min(axis=3)).sum(axis=(0, 1))
+        return self.traits[open_[int(np.argmax(power))]]
+
+    def completed_scores(self):
+        """Answers with skipped traits filled in neutrally (cannot change the top-k)"""
+        return {t: self.answers.get(t, NEUTRAL_ANSWER) for t in self.traits}
+
+
+def simulate(catalog, n_users=2000, k=3, seed=42):
+    """Run simulated users through the adaptive quiz and report its cost"""
+    from matching import get_kernel
+
+    kernel = get_kernel(ADAPTIVE_KERNEL)
+    rng = np.random.default_rng(seed)
+    users = rng.integers(1, 6, size=(n_users, len(catalog.traits)))
+    full_scores = kernel(users / 5.0, catalog.levels, catalog.mask)
+
+    asked = []
+    step_times = []
+    mismatches = 0
+    for user, scores in zip(users, full_scores):
+        quiz = AdaptiveQuiz(catalog, k=k)
+        answers = dict(zip(catalog.traits, user.tolist()))
+        start = time.perf_counter()
+        trait = quiz.next_trait()
+        step_times.append(time.perf_counter() - start)
+        while trait is not None:
+            start = time.perf_counter()
+            quiz.answer(trait, answers[trait])
+            trait = quiz.next_trait()
+            step_times.append(time.perf_counter() - start)
+        asked.append(len(quiz.answers))
+
+        # The app scores the neutrally completed answers, so compare those
+        completed = np.array([list(quiz.completed_scores().values())]) / 5.0
+        got = np.argsort(-kernel(completed, catalog.levels, catalog.mask)[0], kind='stable')[:quiz.k]
+        expected = np.argsort(-scores, kind='stable')[:quiz.k]
+        mismatches += not np.array_equal(expected, got)
+
+    return {
+        'users': n_users,
+        'k': k,
+        'questions_total': len(catalog.traits),
+        'avg_questions': float(np.mean(asked)),
+        'median_questions': float(np.median(asked)),
+        'ms_per_step': float(np.mean(step_times) * 1000),
+        'ranking_mismatches': int(mismatches),
+    }
+
+
+def main():
+    """Run the adaptive quiz simulation from the command line"""
+    from catalog import get_catalog
+
+    parser = argparse.ArgumentParser(description="Simulate the adaptive career quiz")
+    parser.add_argument('--users', type=int, default=2000, help="number of simulated users")
+    parser.add_argument('--top-k', type=int, default=3, help="ranking depth that must be decided")
+    args = parser.parse_args()
+
+    report = simulate(get_catalog(), n_users=args.users, k=args.top_k)
+    print(f"🎯 Adaptive quiz simulation ({report['users']} users, top-{report['k']})")
+    print("=" * 50)
+    print(f"📋 Average questions asked: {report['avg_questions']:.2f} of {report['questions_total']}")
+    print(f"📋 Median questions asked:  {report['median_questions']:.0f}")
+    print(f"⏱️  Computation per step:    {report['ms_per_step']:.3f} ms")
+    print(f"✅ Ranking mismatches vs full quiz: {report['ranking_mismatches']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,17 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
 import os
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
+import uuid
+from neighbors import get_results_index
+from catalog import get_catalog
+from adaptive_quiz import ADAPTIVE_KERNEL, AdaptiveQuiz
+from training import TRAINING_MODE, ensure_training_data, get_streamed_model, get_training_data, get_trained_model
+from artifacts import load_model_artifact
+from segments import get_results_segments
+from sessions import get_session_registry
+from profiling import profiling_enabled, is_authorized, parse_top_n, profile_call
+from singleflight import flight_stats
+from tenants import DEFAULT_TENANT, get_tenant_catalog, get_tenant_registry, tenant_results_path
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -108,266 +117,103 @@ body {
 st.markdown(light_css, unsafe_allow_html=True)
 
 
-# Career database with comprehensive information
-CAREER_DATABASE = {
-    "Software Engineer": {
-        "description": "Design, develop, and maintain software applications and systems using various programming languages and frameworks.",
-        "job_roles": ["Full Stack Developer", "Backend Developer", "Mobile App Developer", "DevOps Engineer"],
-        "salary_range": "$70,000 - $150,000",
-        "tools": ["Python", "JavaScript", "Git", "Docker", "AWS", "React"],
-        "required_traits": {"logical_thinking": 0.8, "tech_affinity": 0.9, "math": 0.7, "creativity": 0.6},
-        "learning_resources": [
-            "IBM SkillsBuild - Software Development",
-            "Coursera - Programming Fundamentals",
-            "FreeCodeCamp - Web Development"
-        ]
-    },
-    "Data Scientist": {
-        "description": "Analyze complex data to extract insights and build predictive models for business decision-making.",
-        "job_roles": ["ML Engineer", "Data Analyst", "Business Intelligence Analyst", "Research Scientist"],
-        "salary_range": "$80,000 - $160,000",
-        "tools": ["Python", "R", "SQL", "Tableau", "TensorFlow", "Jupyter"],
-        "required_traits": {"logical_thinking": 0.9, "math": 0.9, "tech_affinity": 0.8, "analytical": 0.8},
-        "learning_resources": [
-            "IBM Data Science Professional Certificate",
-            "Coursera - Data Science Specialization",
-            "Kaggle Learn - Data Science"
-        ]
-    },
-    "UX/UI Designer": {
-        "description": "Create intuitive and visually appealing user interfaces and experiences for digital products.",
-        "job_roles": ["Product Designer", "Visual Designer", "Interaction Designer", "Design Researcher"],
-        "salary_range": "$60,000 - $120,000",
-        "tools": ["Figma", "Adobe Creative Suite", "Sketch", "InVision", "Principle"],
-        "required_traits": {"creativity": 0.9, "empathy": 0.8, "communication": 0.7, "tech_affinity": 0.6},
-        "learning_resources": [
-            "Google UX Design Certificate",
-            "Coursera - UI/UX Design Specialization",
-            "Adobe Design University"
-        ]
-    },
-    "Marketing Manager": {
-        "description": "Develop and execute marketing strategies to promote products and services to target audiences.",
-        "job_roles": ["Digital Marketing Manager", "Brand Manager", "Content Marketing Manager", "Social Media Manager"],
-        "salary_range": "$55,000 - $110,000",
-        "tools": ["Google Analytics", "HubSpot", "Mailchimp", "Canva", "Hootsuite"],
-        "required_traits": {"creativity": 0.8, "communication": 0.9, "leadership": 0.7, "empathy": 0.6},
-        "learning_resources": [
-            "Google Digital Marketing Certificate",
-            "HubSpot Academy",
-            "Coursera - Digital Marketing Specialization"
-        ]
-    },
-    "Business Analyst": {
-        "description": "Bridge the gap between IT and business by analyzing processes and systems to improve efficiency.",
-        "job_roles": ["Systems Analyst", "Process Improvement Analyst", "Data Analyst", "Project Coordinator"],
-        "salary_range": "$65,000 - $125,000",
-        "tools": ["Excel", "SQL", "Tableau", "JIRA", "Visio", "Power BI"],
-        "required_traits": {"logical_thinking": 0.8, "communication": 0.8, "analytical": 0.8, "leadership": 0.6},
-        "learning_resources": [
-            "IBM Business Analysis Certificate",
-            "Coursera - Business Analytics",
-            "IIBA - Business Analysis Training"
-        ]
-    },
-    "Project Manager": {
-        "description": "Plan, execute, and oversee projects from initiation to completion, ensuring they meet goals and deadlines.",
-        "job_roles": ["Scrum Master", "Program Manager", "Operations Manager", "Team Lead"],
-        "salary_range": "$70,000 - $130,000",
-        "tools": ["Microsoft Project", "JIRA", "Trello", "Slack", "Gantt Charts"],
-        "required_traits": {"leadership": 0.9, "communication": 0.8, "organization": 0.8, "problem_solving": 0.7},
-        "learning_resources": [
-            "PMI Project Management Certificate",
-            "Google Project Management Certificate",
-            "Coursera - Project Management Principles"
-        ]
-    },
-    "Counselor/Therapist": {
-        "description": "Provide mental health support and guidance to individuals dealing with personal challenges.",
-        "job_roles": ["Clinical Therapist", "School Counselor", "Career Counselor", "Family Therapist"],
-        "salary_range": "$45,000 - $85,000",
-        "tools": ["Assessment Tools", "Therapy Software", "Documentation Systems"],
-        "required_traits": {"empathy": 0.9, "communication": 0.9, "patience": 0.8, "listening": 0.8},
-        "learning_resources": [
-            "Psychology Today - Therapy Training",
-            "Coursera - Psychology Courses",
-            "American Counseling Association Resources"
-        ]
-    },
-    "Sales Representative": {
-        "description": "Build relationships with clients and sell products or services to meet revenue targets.",
-        "job_roles": ["Account Manager", "Business Development Rep", "Sales Engineer", "Territory Manager"],
-        "salary_range": "$45,000 - $120,000",
-        "tools": ["CRM Software", "Salesforce", "LinkedIn Sales Navigator", "Email Marketing Tools"],
-        "required_traits": {"communication": 0.9, "persuasion": 0.8, "resilience": 0.7, "empathy": 0.6},
-        "learning_resources": [
-            "Salesforce Trailhead",
-            "HubSpot Sales Training",
-            "LinkedIn Learning - Sales Skills"
-        ]
-    }
-}
-
-# Quiz questions with trait mapping and tooltips
-QUIZ_QUESTIONS = [
-    {
-        "question": "How comfortable are you with solving complex mathematical problems?",
-        "trait": "math",
-        "type": "slider",
-        "tooltip": "Measures your comfort with numbers, formulas, and quantitative reasoning."
-    },
-    {
-        "question": "Rate your ability to think logically and systematically:",
-        "trait": "logical_thinking",
-        "type": "slider",
-        "tooltip": "Assesses your logical reasoning and structured problem-solving."
-    },
-    {
-        "question": "How much do you enjoy coming up with creative solutions?",
-        "trait": "creativity",
-        "type": "slider",
-        "tooltip": "Reflects your ability to generate new ideas and think outside the box."
-    },
-    {
-        "question": "Rate your comfort level with technology and digital tools:",
-        "trait": "tech_affinity",
-        "type": "slider",
-        "tooltip": "Shows your ease with using computers, software, and digital platforms."
-    },
-    {
-        "question": "How well can you understand and relate to others' emotions?",
-        "trait": "empathy",
-        "type": "slider",
-        "tooltip": "Indicates your ability to empathize and connect with others emotionally."
-    },
-    {
-        "question": "Rate your communication and presentation skills:",
-        "trait": "communication",
-        "type": "slider",
-        "tooltip": "Measures your ability to express ideas clearly and effectively."
-    },
-    {
-        "question": "How comfortable are you taking charge and leading others?",
-        "trait": "leadership",
-        "type": "slider",
-        "tooltip": "Assesses your confidence in guiding and motivating teams."
-    },
-    {
-        "question": "Do you prefer working with data and analysis?",
-        "trait": "analytical",
-        "type": "radio",
-        "options": ["Strongly Disagree", "Disagree", "Neutral", "Agree", "Strongly Agree"],
-        "tooltip": "Shows your interest in analyzing information and drawing insights."
-    },
-    {
-        "question": "How patient are you when dealing with challenging situations?",
-        "trait": "patience",
-        "type": "slider",
-        "tooltip": "Reflects your ability to remain calm and persistent."
-    },
-    {
-        "question": "Rate your organizational and planning abilities:",
-        "trait": "organization",
-        "type": "slider",
-        "tooltip": "Measures your skill in managing tasks and time efficiently."
-    }
-]
+# Career catalog (careers and quiz questions) compiled from catalog.json.
+# Streamlit re-executes this script on every rerun, so catalog edits are
+# picked up by new requests without restarting the server.
+_catalog = get_catalog()
+CAREER_DATABASE = _catalog.careers
+QUIZ_QUESTIONS = _catalog.quiz_questions
 
 class CareerGuidanceSystem:
-    def __init__(self):
+    def __init__(self, kernel=None, tenant=DEFAULT_TENANT):
         self.user_data = {}
         self.quiz_scores = {}
-        self.ml_model = None
+        self._ml_model = None
+        self._scaler = None
+        self.kernel = kernel
+        self.tenant = tenant
         self.load_or_create_sample_data()
     
+    @property
+    def matcher(self):
+        """Matcher over the current catalog version of this tenant"""
+        return self.matcher_for(get_tenant_catalog(self.tenant))
+    
+    def matcher_for(self, catalog):
+        """Matcher over a catalog the caller already resolved (e.g. once per rerun)"""
+        return catalog.matcher(self.kernel)
+    
+    @property
+    def ml_model(self):
+        """Tenants' models are looked up per use, so an evicted tenant's model can be freed"""
+        if self.tenant != DEFAULT_TENANT:
+            return get_tenant_registry().get(self.tenant).model
+        return self._ml_model
+    
+    @property
+    def scaler(self):
+        if self.tenant != DEFAULT_TENANT:
+            return get_tenant_registry().get(self.tenant).scaler
+        return self._scaler
+    
+    @property
+    def results_path(self):
+        return tenant_results_path(self.tenant)
+    
     def load_or_create_sample_data(self):
         """Load existing data or create sample dataset for ML model"""
-        try:
-            self.df = pd.read_csv('career_quiz_data.csv')
-        except FileNotFoundError:
-            # Create sample dataset
-            sample_data = []
-            careers = list(CAREER_DATABASE.keys())
-            
-            for _ in range(100):  # Generate 100 sample records
-                record = {}
-                career = np.random.choice(careers)
-                career_traits = CAREER_DATABASE[career]["required_traits"]
-                
-                # Generate scores based on career requirements with some noise
-                for trait in ["math", "logical_thinking", "creativity", "tech_affinity", 
-                             "empathy", "communication", "leadership", "analytical", 
-                             "patience", "organization"]:
-                    if trait in career_traits:
-                        base_score = career_traits[trait]
-                        record[trait] = max(1, min(5, np.random.normal(base_score * 5, 0.5)))
-                    else:
-                        record[trait] = np.random.uniform(1, 5)
-                
-                record['career'] = career
-                sample_data.append(record)
-            
-            self.df = pd.DataFrame(sample_data)
-            self.df.to_csv('career_quiz_data.csv', index=False)
+        if self.tenant != DEFAULT_TENANT:
+            # Tenants get their model from their own artifact
+            self.df = None
+            return
+        if TRAINING_MODE == 'streaming':
+            # Too large to hold in memory; the model is trained chunk by chunk
+            ensure_training_data(CAREER_DATABASE, traits=_catalog.traits)
+            self.df = None
+            return
+        if load_model_artifact() is not None:
+            # The shared model is used instead, so skip this process's copy of the data
+            self.df = None
+            return
+        # Shared by every session in this process; reloaded if the file changes
+        self.df = get_training_data(CAREER_DATABASE, traits=_catalog.traits)
     
     def train_ml_model(self):
         """Train a simple ML model for career prediction"""
-        if len(self.df) > 0:
-            features = ["math", "logical_thinking", "creativity", "tech_affinity", 
-                       "empathy", "communication", "leadership", "analytical", 
-                       "patience", "organization"]
-            
-            X = self.df[features]
-            y = self.df['career']
-            
-            scaler = StandardScaler()
-            X_scaled = scaler.fit_transform(X)
-            
-            self.ml_model = RandomForestClassifier(n_estimators=100, random_state=42)
-            self.ml_model.fit(X_scaled, y)
-            self.scaler = scaler
+        if self.tenant != DEFAULT_TENANT:
+            # Load the tenant now; ml_model and scaler read it from the registry
+            get_tenant_registry().get(self.tenant)
+            return
+        # Reuse the shared on-disk model when the launcher has built one
+        shared = load_model_artifact()
+        if shared is not None:
+            self._ml_model, self._scaler = shared
+        elif TRAINING_MODE == 'streaming':
+            self._ml_model, self._scaler = get_streamed_model(traits=_catalog.traits)
+        else:
+            if self.df is None:
+                # The shared model went stale since the data was skipped
+                self.df = get_training_data(CAREER_DATABASE, traits=_catalog.traits)
+            if len(self.df) > 0:
+                self._ml_model, self._scaler = get_trained_model(self.df, _catalog.traits)
     
-    def calculate_career_match(self, user_scores):
-        """Calculate career match using rule-based logic"""
-        career_scores = {}
-        
-        for career, info in CAREER_DATABASE.items():
-            required_traits = info["required_traits"]
-            total_score = 0
-            trait_count = 0
-            
-            for trait, required_level in required_traits.items():
-                if trait in user_scores:
-                    user_score = user_scores[trait] / 5.0  # Normalize to 0-1
-                    trait_score = 1 - abs(user_score - required_level)
-                    total_score += trait_score
-                    trait_count += 1
-            
-            if trait_count > 0:
-                career_scores[career] = total_score / trait_count
-            else:
-                career_scores[career] = 0
-        
-        return career_scores
+    def calculate_career_match(self, user_scores, catalog=None):
+        """Calculate career match using the configured matching kernel"""
+        matcher = self.matcher if catalog is None else self.matcher_for(catalog)
+        return matcher.score(user_scores)
     
-    def get_personality_tag(self, scores):
-        """Generate personality tag based on dominant traits"""
-        traits_mapping = {
-            "creativity": "Creative Thinker",
-            "logical_thinking": "Analytical Mind",
-            "empathy": "People Person",
-            "leadership": "Natural Leader",
-            "tech_affinity": "Tech Enthusiast",
-            "communication": "Great Communicator",
-            "math": "Problem Solver"
-        }
-        
-        # Find the highest scoring trait
-        max_trait = max(scores.keys(), key=lambda x: scores[x])
-        return traits_mapping.get(max_trait, "Versatile Professional")
+    def what_if(self, user_scores, traits=None, catalog=None):
+        """Score every +/-1 change to the answers in one batch"""
+        matcher = self.matcher if catalog is None else self.matcher_for(catalog)
+        return matcher.sensitivity(user_scores, traits)
+    
+    def get_personality_tag(self, scores, catalog=None):
+        """Personality segment from past results, or the dominant-trait tag until there are enough"""
+        traits = (get_tenant_catalog(self.tenant) if catalog is None else catalog).traits
+        return get_results_segments(self.results_path, traits).tag(scores)
     
-    def save_results(self, user_info, career_result, scores):
-        """Save results to CSV file"""
+    def save_results(self, user_info, career_result, scores, answered=None):
+        """Save results to CSV file (traits outside answered are left blank)"""
         result_data = {
             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'name': user_info.get('name', ''),
@@ -379,32 +225,79 @@ class CareerGuidanceSystem:
             'personality_tag': career_result['personality_tag']
         }
         
-        # Add scores
-        result_data.update(scores)
+        # Add scores; skipped adaptive questions stay empty rather than neutral
+        result_data.update({t: s if answered is None or t in answered else None for t, s in scores.items()})
         
         # Create or append to results file
         results_df = pd.DataFrame([result_data])
         
-        if os.path.exists('results.csv'):
-            results_df.to_csv('results.csv', mode='a', header=False, index=False)
+        if os.path.exists(self.results_path):
+            results_df.to_csv(self.results_path, mode='a', header=False, index=False)
         else:
-            results_df.to_csv('results.csv', index=False)
+            results_df.to_csv(self.results_path, index=False)
 
-# Initialize the system
-if 'guidance_system' not in st.session_state:
-    st.session_state.guidance_system = CareerGuidanceSystem()
-    st.session_state.guidance_system.train_ml_model()
+# Session state keeps only compact data (step, user info, score tuple). The
+# guidance system lives in a TTL registry outside it and is rebuilt on demand.
+if 'session_key' not in st.session_state:
+    st.session_state.session_key = uuid.uuid4().hex
 
 # Initialize session state variables
 if 'current_step' not in st.session_state:
     st.session_state.current_step = 'landing'
 if 'user_info' not in st.session_state:
     st.session_state.user_info = {}
-if 'quiz_scores' not in st.session_state:
-    st.session_state.quiz_scores = {}
+if 'score_tuple' not in st.session_state:
+    st.session_state.score_tuple = ()
+if 'answered_traits' not in st.session_state:
+    st.session_state.answered_traits = None
+
+# Tenant from ?tenant= (or CAREER_TENANT); switching tenant restarts the quiz
+_tenant = get_tenant_registry().resolve(st.query_params.get('tenant'))
+if st.session_state.get('tenant', _tenant) != _tenant:
+    st.session_state.current_step = 'landing'
+    st.session_state.score_tuple = ()
+    st.session_state.adaptive_answers = {}
+st.session_state.tenant = _tenant
+# The catalog is resolved once per rerun, so a hot reload mid-rerun cannot
+# mix two versions on one page (the next rerun picks up the new one)
+if _tenant != DEFAULT_TENANT:
+    # One hit or miss per rerun for the tenant cache metrics
+    _rerun_catalog = get_tenant_registry().request(_tenant).catalog
+else:
+    _rerun_catalog = _catalog
+
+def current_catalog():
+    """Compiled catalog of this session's tenant, as of the start of this rerun"""
+    return _rerun_catalog
+
+def build_guidance_system():
+    system = CareerGuidanceSystem(tenant=st.session_state.tenant)
+    system.train_ml_model()
+    # The training data and model are process-wide, not per-session memory
+    get_session_registry().mark_shared(system.df, system.ml_model, system.scaler)
+    return system
+
+def get_guidance_system():
+    return get_session_registry().get(st.session_state.session_key, f"guidance_system:{st.session_state.tenant}",
+                                      build_guidance_system)
+
+def get_quiz_scores():
+    return dict(st.session_state.score_tuple)
+
+def set_quiz_scores(scores):
+    st.session_state.score_tuple = tuple(scores.items())
 
 def main():
+    get_session_registry().touch(st.session_state.session_key, {
+        'current_step': st.session_state.current_step,
+        'user_info': st.session_state.user_info,
+        'score_tuple': st.session_state.score_tuple,
+        'tenant': st.session_state.tenant,
+    })
     # Sidebar with navigation
+    requested_tenant = st.query_params.get('tenant')
+    if requested_tenant and requested_tenant != st.session_state.tenant:
+        st.sidebar.warning(f"Unknown institution '{requested_tenant}' - showing the default catalog.")
     st.sidebar.markdown("---")
     st.sidebar.markdown("## 🎯 AI Career Guidance")
     st.sidebar.markdown("### Instructions:")
@@ -423,10 +316,15 @@ def main():
     st.sidebar.markdown("- [Google Digital Garage](https://learndigital.withgoogle.com/digitalgarage)")
     st.sidebar.markdown("- [LinkedIn Learning](https://www.linkedin.com/learning/)")
     st.sidebar.markdown("---")
+    query = st.sidebar.text_input("🔎 Search careers", placeholder="e.g. python, design, counseling")
+    if query:
+        show_search_results(query)
+    st.sidebar.markdown("---")
     if st.sidebar.button("🔄 Start Over"):
         st.session_state.current_step = 'landing'
         st.session_state.user_info = {}
-        st.session_state.quiz_scores = {}
+        set_quiz_scores({})
+        st.session_state.adaptive_answers = {}
         st.rerun()
     # Main header
     st.markdown('<h1 class="main-header">🎯 AI Career Guidance System</h1>', unsafe_allow_html=True)
@@ -491,53 +389,92 @@ def show_user_info_form():
         else:
             st.error("Please enter your name to continue.")
 
+def render_question(number, q, key):
+    st.markdown(f"**Question {number}: {q['question']}** <span title='{q.get('tooltip','')}' style='color:#888;cursor:help;'>ℹ️</span>", unsafe_allow_html=True)
+    if q['type'] == 'slider':
+        return st.slider(
+            f"Q{number}",
+            min_value=1,
+            max_value=5,
+            value=3,
+            key=key,
+            label_visibility="collapsed"
+        )
+    # radio
+    options = q['options']
+    selection = st.radio(
+        f"Q{number}",
+        options,
+        key=key,
+        label_visibility="collapsed"
+    )
+    return options.index(selection) + 1
+
+def finish_quiz(scores, message=None, answered=None):
+    set_quiz_scores(scores)
+    # None means every question was answered
+    st.session_state.answered_traits = answered
+    st.session_state.adaptive_answers = {}
+    st.session_state.current_step = 'results'
+    st.toast(message or "Quiz completed! Generating your personalized career recommendations...", icon="🎉")
+    st.balloons()
+    st.rerun()
+
 def show_quiz():
     st.markdown('<h2 class="sub-header">📋 Career Assessment Quiz</h2>', unsafe_allow_html=True)
     st.markdown("Rate each statement based on how well it describes you (1 = Strongly Disagree, 5 = Strongly Agree)")
+    # Early stopping is only proven for the l1 kernel; other kernels always get the full quiz
+    adaptive_available = get_guidance_system().matcher_for(current_catalog()).kernel_name == ADAPTIVE_KERNEL
+    if adaptive_available and st.toggle("⚡ Adaptive mode - only ask questions that can still change your top matches", key='adaptive_mode'):
+        show_adaptive_quiz()
+        return
     scores = {}
     with st.form("career_quiz"):
-        for i, q in enumerate(QUIZ_QUESTIONS):
-            st.markdown(f"**Question {i+1}: {q['question']}** <span title='{q.get('tooltip','')}' style='color:#888;cursor:help;'>ℹ️</span>", unsafe_allow_html=True)
-            if q['type'] == 'slider':
-                score = st.slider(
-                    f"Q{i+1}",
-                    min_value=1,
-                    max_value=5,
-                    value=3,
-                    key=f"q_{i}",
-                    label_visibility="collapsed"
-                )
-            else:  # radio
-                options = q['options']
-                selection = st.radio(
-                    f"Q{i+1}",
-                    options,
-                    key=f"q_{i}",
-                    label_visibility="collapsed"
-                )
-                score = options.index(selection) + 1
-            scores[q['trait']] = score
+        for i, q in enumerate(current_catalog().quiz_questions):
+            scores[q['trait']] = render_question(i + 1, q, key=f"q_{i}")
             st.markdown("---")
         submitted = st.form_submit_button("Get My Career Recommendations 🎯", type="primary")
         if submitted:
-            st.session_state.quiz_scores = scores
-            st.session_state.current_step = 'results'
-            st.toast("Quiz completed! Generating your personalized career recommendations...", icon="🎉")
-            st.balloons()
+            finish_quiz(scores)
+
+def show_adaptive_quiz():
+    catalog = current_catalog()
+    questions = catalog.quiz_questions
+    # The results page shows the top three careers
+    quiz = AdaptiveQuiz(catalog, k=3)
+    answers = st.session_state.setdefault('adaptive_answers', {})
+    for trait, score in answers.items():
+        quiz.answer(trait, score)
+    trait = quiz.next_trait()
+    if trait is None:
+        skipped = len(questions) - len(answers)
+        finish_quiz(quiz.completed_scores(),
+                    f"Your top matches are decided - {skipped} question(s) skipped!" if skipped else None,
+                    tuple(answers) if skipped else None)
+        return
+    st.progress(len(answers) / len(questions), text=f"{len(answers)} answered, at most {len(questions) - len(answers)} to go")
+    with st.form(f"adaptive_quiz_{trait}"):
+        score = render_question(len(answers) + 1, questions[quiz.traits.index(trait)], key=f"aq_{trait}")
+        if st.form_submit_button("Next ➡️", type="primary"):
+            answers[trait] = score
             st.rerun()
 
 def show_results():
     st.markdown('<h2 class="sub-header">🧠 Your Career Recommendations</h2>', unsafe_allow_html=True)
+    quiz_scores = get_quiz_scores()
     # Calculate career matches
-    career_scores = st.session_state.guidance_system.calculate_career_match(st.session_state.quiz_scores)
+    catalog = current_catalog()
+    career_scores = get_guidance_system().calculate_career_match(quiz_scores, catalog)
     sorted_careers = sorted(career_scores.items(), key=lambda x: x[1], reverse=True)
     # Get top 3 recommendations
     top_career = sorted_careers[0][0]
     alternatives = [career[0] for career in sorted_careers[1:3]]
     # Calculate confidence score
     confidence = sorted_careers[0][1] * 100
-    # Get personality tag
-    personality_tag = st.session_state.guidance_system.get_personality_tag(st.session_state.quiz_scores)
+    # Get personality tag from the questions actually answered
+    answered = st.session_state.answered_traits
+    personality_tag = get_guidance_system().get_personality_tag(
+        quiz_scores if answered is None else {t: quiz_scores[t] for t in answered}, catalog)
     # Prepare result data
     career_result = {
         'top_career': top_career,
@@ -552,16 +489,23 @@ def show_results():
         st.markdown(f"### 🎯 **{top_career}** <span class='badge {badge}'>{confidence:.1f}% match</span>", unsafe_allow_html=True)
     with col2:
         st.metric("Personality Type", personality_tag)
+    skipped = [] if answered is None else [t for t in quiz_scores if t not in answered]
     with col3:
         if st.button("💾 Save Results"):
-            st.session_state.guidance_system.save_results(
+            get_guidance_system().save_results(
                 st.session_state.user_info, 
                 career_result, 
-                st.session_state.quiz_scores
+                quiz_scores,
+                answered
             )
             st.success("Results saved!")
-        csv = pd.DataFrame([st.session_state.user_info | st.session_state.quiz_scores | career_result]).to_csv(index=False).encode('utf-8')
+        # Like saved results, the export leaves skipped questions blank
+        exported = {t: None if t in skipped else s for t, s in quiz_scores.items()}
+        csv = pd.DataFrame([st.session_state.user_info | exported | career_result]).to_csv(index=False).encode('utf-8')
         st.download_button("⬇️ Download Results", csv, "career_results.csv", "text/csv")
+    if skipped:
+        st.caption(f"ℹ️ Not asked: {', '.join(t.replace('_', ' ').title() for t in skipped)}. "
+                   "These count as a neutral 3 in the match, confidence, what-if and trait charts below.")
     # Career details
     show_career_details(top_career, "🏆 Top Recommendation")
     st.markdown("### 🔄 Alternative Career Paths")
@@ -572,13 +516,18 @@ def show_results():
     with col2:
         if len(alternatives) > 1:
             show_career_details(alternatives[1], "🥉 Third Choice", compact=True)
+    # What-if analysis
+    show_what_if(quiz_scores)
+    # Similar past users
+    show_similar_users(quiz_scores)
     # Trait analysis
-    show_trait_analysis(top_career)
+    show_trait_analysis(quiz_scores, top_career, skipped)
     # Action buttons
     col1, col2 = st.columns(2)
     with col1:
         if st.button("🔄 Retake Quiz", type="secondary"):
             st.session_state.current_step = 'quiz'
+            st.session_state.adaptive_answers = {}
             st.rerun()
     with col2:
         if st.button("👤 Update Info", type="secondary"):
@@ -586,26 +535,79 @@ def show_results():
             st.rerun()
 
 def show_career_details(career_name, title, compact=False):
-    career_info = CAREER_DATABASE[career_name]
+    catalog = current_catalog()
+    career_info = catalog.display[career_name]
     if not compact:
         st.markdown(f"#### {title}")
         with st.expander(f"Learn more about {career_name}", expanded=True):
             st.markdown(f"**Description:** {career_info['description']}")
-            st.markdown(f"**Job Roles:** {', '.join(career_info['job_roles'])}")
+            st.markdown(f"**Job Roles:** {career_info['job_roles']}")
             st.markdown(f"**Salary Range:** {career_info['salary_range']}")
-            st.markdown(f"**Tools & Technologies:** {', '.join(career_info['tools'])}")
+            st.markdown(f"**Tools & Technologies:** {career_info['tools']}")
             st.markdown("**Learning Resources:**")
             for resource in career_info['learning_resources']:
                 st.markdown(f"• {resource}")
+            related = catalog.similarity.related(career_name, k=3)
+            if related:
+                st.markdown("**Related Careers:**")
+                for other, similarity in related:
+                    st.markdown(f"• **{other}** ({similarity * 100:.0f}% similar) - {catalog.display[other]['short_description']}")
     else:
         with st.expander(f"{career_name}"):
-            st.markdown(f"{career_info['description'][:100]}...")
+            st.markdown(career_info['short_description'])
+            st.markdown(f"**Salary:** {career_info['salary_range']}")
+
+def show_search_results(query, k=5):
+    catalog = current_catalog()
+    results = catalog.search_index.search(query, k=k)
+    if not results:
+        st.sidebar.markdown("No matching careers found.")
+        return
+    for career_name, _ in results:
+        career_info = catalog.display[career_name]
+        with st.sidebar.expander(career_name):
+            st.markdown(career_info['short_description'])
+            st.markdown(f"**Job Roles:** {career_info['job_roles']}")
             st.markdown(f"**Salary:** {career_info['salary_range']}")
 
-def show_trait_analysis(top_career=None):
+def show_what_if(scores):
+    with st.expander("🔀 What-if: which answers would change my recommendation?"):
+        traits = st.multiselect(
+            "Traits to vary by ±1",
+            list(scores.keys()),
+            default=list(scores.keys()),
+            format_func=lambda t: t.replace('_', ' ').title()
+        )
+        if not traits:
+            st.markdown("Pick at least one trait to vary.")
+            return
+        report = get_guidance_system().what_if(scores, traits, current_catalog())
+        changes = [c for c in report['changes'] if c['flips_top'] or c['changes_alternatives']]
+        if not changes:
+            st.markdown("Your recommendations are stable - no single ±1 answer change alters them.")
+            return
+        for change in changes:
+            trait_name = change['trait'].replace('_', ' ').title()
+            if change['flips_top']:
+                effect = f"makes <b>{change['top_career']}</b> your top match ({change['confidence']:.1f}%)"
+            else:
+                effect = f"changes your alternatives to {', '.join(change['alternatives'])}"
+            st.markdown(f'<div class="trait-score">{trait_name} {change["from"]} → {change["to"]}: {effect}</div>', unsafe_allow_html=True)
+
+def show_similar_users(scores, k=10):
+    neighbours = get_results_index(get_guidance_system().results_path, current_catalog().traits).query(scores, k=k)
+    if not neighbours:
+        return
+    st.markdown("### 👥 People Like You")
+    st.markdown(f"What the {len(neighbours)} most similar past users were recommended:")
+    counts = pd.Series([n['recommended_career'] for n in neighbours]).value_counts()
+    for career, count in counts.items():
+        st.markdown(f'<div class="trait-score">{career}: {count} of {len(neighbours)}</div>', unsafe_allow_html=True)
+
+def show_trait_analysis(quiz_scores, top_career=None, skipped=()):
     st.markdown("### 📊 Your Trait Analysis")
-    traits = list(st.session_state.quiz_scores.keys())
-    scores = list(st.session_state.quiz_scores.values())
+    traits = list(quiz_scores.keys())
+    scores = list(quiz_scores.values())
     # Radar chart using Plotly
     fig = go.Figure()
     fig.add_trace(go.Scatterpolar(
@@ -617,7 +619,7 @@ def show_trait_analysis(top_career=None):
     ))
     # If top_career is provided, show average required traits for comparison
     if top_career:
-        required = CAREER_DATABASE[top_career]["required_traits"]
+        required = current_catalog().careers[top_career]["required_traits"]
         avg_required = [required.get(trait, 0.5) * 5 for trait in traits]
         fig.add_trace(go.Scatterpolar(
             r=avg_required + [avg_required[0]],
@@ -641,9 +643,31 @@ def show_trait_analysis(top_career=None):
         st.plotly_chart(fig, use_container_width=True)
     with col2:
         st.markdown("#### Trait Breakdown")
-        for trait, score in st.session_state.quiz_scores.items():
+        for trait, score in quiz_scores.items():
             trait_name = trait.replace('_', ' ').title()
-            st.markdown(f'<div class="trait-score">{trait_name}: {score}/5</div>', unsafe_allow_html=True)
+            note = " (not asked, neutral)" if trait in skipped else ""
+            st.markdown(f'<div class="trait-score">{trait_name}: {score}/5{note}</div>', unsafe_allow_html=True)
+
+def profile_rerun():
+    """Run main() under the profiler and show the hottest functions to the admin"""
+    step = st.session_state.current_step
+    top_n = parse_top_n(st.query_params.get('profile_top'))
+    # Only this rerun is profiled; the next interaction runs normally
+    del st.query_params['profile']
+    path, rows = profile_call(main, step, top_n=top_n)
+    with st.expander(f"🔬 Profile of this rerun ({step})", expanded=True):
+        st.caption(f"Saved to {path}")
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        st.caption("Shared loads in this process (coalesced = calls that waited on another session's load)")
+        st.dataframe(pd.DataFrame(flight_stats()).T, use_container_width=True)
+        tenant_stats = get_tenant_registry().stats()['tenants']
+        if tenant_stats:
+            st.caption("Tenant cache (hit rate and load latency per institution)")
+            st.dataframe(pd.DataFrame(tenant_stats).T, use_container_width=True)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if profiling_enabled() and is_authorized(st.query_params.get('profile')):
+        profile_rerun()
+    else:
+        main()
\ No newline at end of file
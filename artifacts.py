@@ -0,0 +1,154 @@
+"""
+AI Career Guidance System - Shared Artifacts
+============================================
+
+Builds the trained model and the compiled catalog matrices once on disk so
+every worker process loads them instead of retraining and recompiling.
+Numpy arrays are memory-mapped read-only, so workers on the same host share
+those pages through the OS page cache.
+
+A ``manifest.json`` records which training data and catalog file the
+artifacts were built from; stale artifacts are simply ignored.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+import joblib
+import numpy as np
+
+from singleflight import get_flight
+from training import DATA_PATH, TRAINING_MODE, ensure_training_data, train_from_path
+
+ARTIFACT_DIR = os.environ.get('CAREER_ARTIFACT_DIR', 'artifacts')
+
+MANIFEST_FILE = 'manifest.json'
+MODEL_FILE = 'model.joblib'
+LEVELS_FILE = 'catalog_levels.npy'
+MASK_FILE = 'catalog_mask.npy'
+
+_model_cache = {}
+_model_lock = threading.Lock()
+
+
+def file_signature(path):
+    """(size, mtime_ns) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_manifest(artifact_dir=None):
+    """Return the artifact manifest, or None if nothing has been built"""
+    try:
+        with open(os.path.join(artifact_dir or ARTIFACT_DIR, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def atomic_write(path, write):
+    """Call write(tmp_path) and rename the result over path, so readers never see a partial file"""
+    root, ext = os.path.splitext(path)
+    tmp = f"{root}.tmp{os.getpid()}-{threading.get_ident()}{ext}"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def build_artifacts(artifact_dir=None, data_path=DATA_PATH, catalog_path=None, force=False, catalog=None):
+    """Build the shared model and catalog artifacts unless they are already current"""
+    from catalog import DEFAULT_CATALOG_PATH, get_catalog
+
+    artifact_dir = artifact_dir or ARTIFACT_DIR
+    catalog_path = catalog_path or DEFAULT_CATALOG_PATH
+    catalog = catalog or get_catalog(catalog_path)
+    ensure_training_data(catalog.careers, data_path, catalog.traits)
+
+    data_signature = file_signature(data_path)
+    catalog_digest = file_digest(catalog_path)
+    manifest = read_manifest(artifact_dir)
+    if (not force and manifest is not None
+            and manifest.get('data_signature') == data_signature
+            and manifest.get('catalog_digest') == catalog_digest
+            and manifest.get('training_mode', 'memory') == TRAINING_MODE):
+        return dict(manifest, built=False)
+
+    os.makedirs(artifact_dir, exist_ok=True)
+    model, scaler, training_rows = train_from_path(catalog.careers, data_path, traits=catalog.traits)
+    # Uncompressed so numpy arrays inside the model can be memory-mapped
+    atomic_write(os.path.join(artifact_dir, MODEL_FILE),
+                  lambda p: joblib.dump({'model': model, 'scaler': scaler}, p, compress=0))
+    for name, array in ((LEVELS_FILE, catalog.levels), (MASK_FILE, catalog.mask)):
+        atomic_write(os.path.join(artifact_dir, name), lambda p, a=np.asarray(array): np.save(p, a))
+
+    manifest = {
+        'built_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'data_path': os.path.abspath(data_path),
+        'data_signature': data_signature,
+        'training_rows': training_rows,
+        'training_mode': TRAINING_MODE,
+        'catalog_digest': catalog_digest,
+        'career_names': catalog.career_names,
+        'traits': catalog.traits,
+    }
+    # The manifest goes last so readers never see it ahead of its files
+    atomic_write(os.path.join(artifact_dir, MANIFEST_FILE), lambda p: _write_json(p, manifest))
+    return dict(manifest, built=True)
+
+
+def load_model_artifact(data_path=DATA_PATH, artifact_dir=None):
+    """Return the shared (model, scaler) if built from the current data, else None"""
+    artifact_dir = artifact_dir or ARTIFACT_DIR
+    manifest = read_manifest(artifact_dir)
+    if manifest is None or manifest.get('data_signature') != file_signature(data_path):
+        return None
+    key = (os.path.abspath(artifact_dir), manifest['built_at'], tuple(manifest['data_signature']))
+    cached = _model_cache.get(key)
+    if cached is not None:
+        return cached
+
+    def load():
+        result = read_model_artifact(artifact_dir)
+        with _model_lock:
+            _model_cache[key] = result
+        return result
+
+    return get_flight('model_artifact').do(key, load)
+
+
+def read_model_artifact(artifact_dir=None):
+    """Load (model, scaler) from an artifact directory, memory-mapped and uncached"""
+    bundle = joblib.load(os.path.join(artifact_dir or ARTIFACT_DIR, MODEL_FILE), mmap_mode='r')
+    return bundle['model'], bundle['scaler']
+
+
+def load_catalog_arrays(catalog_digest, career_names, traits, artifact_dir=None):
+    """Memory-map the compiled trait matrices if they match this catalog, else None"""
+    artifact_dir = artifact_dir or ARTIFACT_DIR
+    manifest = read_manifest(artifact_dir)
+    if (manifest is None or manifest.get('catalog_digest') != catalog_digest
+            or manifest.get('career_names') != list(career_names)
+            or manifest.get('traits') != list(traits)):
+        return None
+    try:
+        levels = np.load(os.path.join(artifact_dir, LEVELS_FILE), mmap_mode='r')
+        mask = np.load(os.path.join(artifact_dir, MASK_FILE), mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    return levels, mask
@@ -0,0 +1,222 @@
+"""
+AI Career Guidance System - Career Catalog
+==========================================
+
+Loads the career catalog (careers and quiz questions) from ``catalog.json``
+or a YAML file, validates it, and compiles it once into the structures the
+app reads on every request: the careers x traits matrix, a career index,
+pre-rendered display metadata and the full-text search index. The
+related-careers similarity index is built on first use and carried over
+incrementally when the catalog is edited.
+
+The compiled catalog is cached per file and swapped atomically when the
+file's modification time changes, so catalog edits reach new requests without
+restarting workers. Set ``CAREER_CATALOG`` to point at a different file.
+"""
+
+import json
+import os
+import threading
+import time
+
+from artifacts import file_digest, load_catalog_arrays
+from matching import CareerMatcher, compile_trait_matrix
+from search import CareerSearchIndex
+from similarity import CareerSimilarity
+from singleflight import get_flight
+
+DEFAULT_CATALOG_PATH = os.environ.get(
+    'CAREER_CATALOG', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'catalog.json'))
+
+CAREER_FIELDS = ['description', 'job_roles', 'salary_range', 'tools', 'required_traits', 'learning_resources']
+QUESTION_FIELDS = ['question', 'trait', 'type']
+QUESTION_TYPES = ['slider', 'radio']
+
+
+def load_catalog_file(path):
+    """Read a raw catalog dict from a JSON or YAML file"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("PyYAML is required for YAML catalogs: pip install pyyaml")
+            try:
+                return yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid YAML in {path}: {e}")
+        return json.load(f)
+
+
+def validate_catalog(data):
+    """Check a raw catalog against the schema, raising ValueError on problems"""
+    if not isinstance(data, dict):
+        raise ValueError("Catalog must be a mapping with 'careers' and 'quiz_questions'")
+    careers = data.get('careers')
+    questions = data.get('quiz_questions')
+    if not isinstance(careers, dict) or not careers:
+        raise ValueError("Catalog needs a non-empty 'careers' mapping")
+    if not isinstance(questions, list) or not questions:
+        raise ValueError("Catalog needs a non-empty 'quiz_questions' list")
+
+    for career_name, career_info in careers.items():
+        if not isinstance(career_info, dict):
+            raise ValueError(f"Career {career_name} must be a mapping")
+        for field in CAREER_FIELDS:
+            if field not in career_info:
+                raise ValueError(f"Missing {field} in {career_name}")
+        if not isinstance(career_info['required_traits'], dict):
+            raise ValueError(f"Invalid traits format for {career_name}")
+        for trait, value in career_info['required_traits'].items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 1:
+                raise ValueError(f"Invalid trait value for {trait} in {career_name}")
+
+    for i, question in enumerate(questions):
+        if not isinstance(question, dict):
+            raise ValueError(f"Question {i+1} must be a mapping")
+        for field in QUESTION_FIELDS:
+            if field not in question:
+                raise ValueError(f"Missing {field} in question {i+1}")
+        if not isinstance(question['trait'], str):
+            raise ValueError(f"Invalid trait name in question {i+1}")
+        if question['type'] not in QUESTION_TYPES:
+            raise ValueError(f"Invalid question type in question {i+1}")
+        options = question.get('options', [])
+        if question['type'] == 'radio' and (not isinstance(options, list) or len(options) != 5):
+            raise ValueError(f"Radio question {i+1} needs 5 options")
+
+
+class CompiledCatalog:
+    """Immutable, pre-compiled view of one catalog version"""
+
+    def __init__(self, data, version=None, digest=None, artifact_dir=None):
+        validate_catalog(data)
+        self.careers = data['careers']
+        self.quiz_questions = data['quiz_questions']
+        self.version = version
+        self.digest = digest
+        self.traits = [q['trait'] for q in self.quiz_questions]
+        self.career_names = list(self.careers)
+        # Prefer the shared, memory-mapped matrices built by the launcher
+        shared = load_catalog_arrays(digest, self.career_names, self.traits, artifact_dir) if digest else None
+        if shared is not None:
+            self.levels, self.mask = shared
+        else:
+            _, self.levels, self.mask = compile_trait_matrix(self.careers, self.traits)
+        self.career_index = {name: i for i, name in enumerate(self.career_names)}
+        self.display = {name: self._display_metadata(info) for name, info in self.careers.items()}
+        self.search_index = CareerSearchIndex(self.careers)
+        self._matchers = {}
+        self._similarity = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _display_metadata(info):
+        return {
+            'description': info['description'],
+            'short_description': f"{info['description'][:100]}...",
+            'job_roles': ', '.join(info['job_roles']),
+            'tools': ', '.join(info['tools']),
+            'salary_range': info['salary_range'],
+            'learning_resources': list(info['learning_resources']),
+        }
+
+    def matcher(self, kernel=None):
+        """Return a cached matcher over this catalog's trait matrix"""
+        key = kernel or ''
+        matcher = self._matchers.get(key)
+        if matcher is None:
+            with self._lock:
+                matcher = self._matchers.get(key)
+                if matcher is None:
+                    matcher = CareerMatcher.from_matrix(
+                        self.career_names, self.traits, self.levels, self.mask, kernel=kernel)
+                    self._matchers[key] = matcher
+        return matcher
+
+    @property
+    def similarity(self):
+        """Related-career index for this catalog version, built on first use"""
+        if self._similarity is None:
+            with self._lock:
+                if self._similarity is None:
+                    self._similarity = CareerSimilarity(self.careers, self.traits)
+        return self._similarity
+
+    def inherit_similarity(self, previous):
+        """Reuse a previous version's similarity index, updating only changed careers"""
+        if previous is not None and previous._similarity is not None and previous.traits == self.traits:
+            self._similarity = previous._similarity.with_changes(previous.careers, self.careers)
+
+
+class CatalogStore:
+    """Caches the compiled catalog for a file and hot-swaps it on change"""
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH, check_interval=1.0, artifact_dir=None):
+        self.path = path
+        self.check_interval = check_interval
+        self.artifact_dir = artifact_dir
+        self._lock = threading.Lock()
+        self._signature = None
+        self._checked_at = 0.0
+        self._catalog = None
+        self.reload_count = 0
+        self.last_error = None
+
+    def _file_signature(self):
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self):
+        """Return the current compiled catalog, reloading it if the file changed"""
+        catalog = self._catalog
+        now = time.monotonic()
+        if catalog is not None and now - self._checked_at < self.check_interval:
+            return catalog
+        self._checked_at = now
+        try:
+            signature = self._file_signature()
+        except OSError as e:
+            if catalog is None:
+                raise
+            self.last_error = e
+            return catalog
+        if signature == self._signature:
+            return catalog
+        # Every session that notices the change waits on one compile
+        return get_flight('catalog').do((self.path, signature), lambda: self._reload(signature))
+
+    def _reload(self, signature):
+        with self._lock:
+            if signature == self._signature:
+                return self._catalog
+            try:
+                compiled = CompiledCatalog(load_catalog_file(self.path), version=signature,
+                                           digest=file_digest(self.path), artifact_dir=self.artifact_dir)
+            except (ValueError, ImportError) as e:
+                # Keep serving the last good catalog if an edit is broken
+                if self._catalog is None:
+                    raise
+                self.last_error = e
+                print(f"⚠️ Catalog reload failed, keeping previous version: {e}")
+            else:
+                compiled.inherit_similarity(self._catalog)
+                self._catalog = compiled
+                self.reload_count += 1
+                self.last_error = None
+            self._signature = signature
+            return self._catalog
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_catalog(path=None):
+    """Return the compiled catalog for a file (defaults to CAREER_CATALOG)"""
+    key = os.path.abspath(path or DEFAULT_CATALOG_PATH)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(key, CatalogStore(key))
+    return store.get()
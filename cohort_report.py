@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+AI Career Guidance System - Cohort Reports
+==========================================
+
+Generates a self-contained HTML report per student (top career,
+alternatives, career details and trait radar) plus a cohort summary page
+from one CSV, for schools that assess whole classes at once.
+
+The cohort is split into chunks that are scored in batch and rendered
+across a process pool. Each worker loads the catalog once and caches the
+page template and per-career fragments, so only student-specific markup is
+built per report. The radar is inline SVG, keeping reports small and
+viewable offline.
+
+Input columns: name, age, education, stream and one 1-5 column per quiz trait.
+
+Usage:
+    python cohort_report.py students.csv [--out reports] [--workers 4] [--tenant acme]
+    python cohort_report.py --sample 500 students.csv
+"""
+
+import argparse
+import html
+import math
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from string import Template
+
+import numpy as np
+import pandas as pd
+
+from catalog import get_catalog
+from segments import get_results_segments
+from tenants import get_tenant_registry, tenant_results_path
+
+INFO_COLUMNS = ['name', 'age', 'education', 'stream']
+
+PAGE_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<style>
+body { font-family: sans-serif; background: #f0f4f9; color: #262730; margin: 0; }
+.main-container { background: #fff; border-radius: 18px; max-width: 900px; margin: 2rem auto;
+                  padding: 2rem; box-shadow: 0 8px 32px 0 rgba(31, 119, 180, 0.15); }
+h1 { color: #3a3a7c; text-align: center; }
+.career-card { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white;
+               padding: 1.2rem; border-radius: 12px; margin: 1rem 0; }
+.trait-score { background: #f8f9fa; padding: 0.4rem 1rem; border-radius: 7px; margin: 0.3rem 0;
+               border-left: 5px solid #1f77b4; }
+.badge { padding: 0.25em 0.7em; border-radius: 0.5em; color: white; font-weight: 700; }
+.badge-green { background: #27ae60; } .badge-orange { background: #f39c12; } .badge-red { background: #e74c3c; }
+table { border-collapse: collapse; width: 100%; }
+th, td { text-align: left; padding: 0.4rem; border-bottom: 1px solid #e0e0e0; }
+.bar { background: #1f77b4; height: 1rem; border-radius: 4px; }
+.columns { display: flex; gap: 1.5rem; flex-wrap: wrap; }
+.columns > div { flex: 1; min-width: 260px; }
+</style>
+</head>
+<body><div class="main-container">
+$body
+<p style="text-align:center;color:#888;">Generated $generated by the AI Career Guidance System</p>
+</div></body>
+</html>
+""")
+
+STUDENT_TEMPLATE = Template("""<h1>🎯 Career Report: $name</h1>
+<p style="text-align:center;">Age $age · $education · $stream</p>
+<div class="career-card"><h2>🏆 $top_career <span class="badge $badge">$confidence% match</span></h2>
+<p>Personality type: <b>$personality_tag</b></p></div>
+$top_details
+<h3>🔄 Alternative Career Paths</h3>
+<div class="columns">$alternatives</div>
+<h3>📊 Trait Analysis</h3>
+<div class="columns"><div>$radar</div><div>$trait_breakdown</div></div>
+""")
+
+# Per-process state, set up once by _init_worker
+_catalog = None
+_matcher = None
+_segments = None
+
+
+def _init_worker(catalog_path, kernel, segments):
+    global _catalog, _matcher, _segments
+    _catalog = get_catalog(catalog_path)
+    _matcher = _catalog.matcher(kernel)
+    _segments = segments
+    _career_details.cache_clear()
+    _ideal_polygon.cache_clear()
+    _radar_axes.cache_clear()
+
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-') or 'student'
+
+
+@lru_cache(maxsize=None)
+def _career_details(career, compact):
+    """Rendered career card fragment, shared by every report that mentions the career"""
+    info = _catalog.display[career]
+    name = html.escape(career)
+    if compact:
+        return (f"<div><h4>{name}</h4><p>{html.escape(info['short_description'])}</p>"
+                f"<p><b>Salary:</b> {html.escape(info['salary_range'])}</p></div>")
+    resources = ''.join(f"<li>{html.escape(r)}</li>" for r in info['learning_resources'])
+    return (f"<h3>Learn more about {name}</h3>"
+            f"<p><b>Description:</b> {html.escape(info['description'])}</p>"
+            f"<p><b>Job Roles:</b> {html.escape(info['job_roles'])}</p>"
+            f"<p><b>Salary Range:</b> {html.escape(info['salary_range'])}</p>"
+            f"<p><b>Tools &amp; Technologies:</b> {html.escape(info['tools'])}</p>"
+            f"<p><b>Learning Resources:</b></p><ul>{resources}</ul>")
+
+
+def _polygon_points(values, size=360, radius=140):
+    n = len(values)
+    center = size / 2
+    points = []
+    for i, value in enumerate(values):
+        angle = 2 * math.pi * i / n - math.pi / 2
+        r = radius * value / 5
+        points.append(f"{center + r * math.cos(angle):.1f},{center + r * math.sin(angle):.1f}")
+    return ' '.join(points)
+
+
+@lru_cache(maxsize=None)
+def _radar_axes():
+    """Grid rings, spokes and labels, identical for every report"""
+    traits = _catalog.traits
+    rings = ''.join(f'<polygon points="{_polygon_points([level] * len(traits))}" fill="none" stroke="#ddd"/>'
+                    for level in range(1, 6))
+    labels = []
+    for i, trait in enumerate(traits):
+        angle = 2 * math.pi * i / len(traits) - math.pi / 2
+        x, y = 180 + 165 * math.cos(angle), 180 + 165 * math.sin(angle)
+        labels.append(f'<line x1="180" y1="180" x2="{180 + 140 * math.cos(angle):.1f}" '
+                      f'y2="{180 + 140 * math.sin(angle):.1f}" stroke="#ddd"/>'
+                      f'<text x="{x:.1f}" y="{y:.1f}" font-size="10" text-anchor="middle">'
+                      f'{html.escape(trait.replace("_", " ").title())}</text>')
+    return rings + ''.join(labels)
+
+
+@lru_cache(maxsize=None)
+def _ideal_polygon(career):
+    """The career's ideal trait polygon (same 0.5 default as the app's radar)"""
+    required = _catalog.careers[career]['required_traits']
+    points = _polygon_points([required.get(t, 0.5) * 5 for t in _catalog.traits])
+    return f'<polygon points="{points}" fill="rgba(255,127,14,0.25)" stroke="rgb(255,127,14)"/>'
+
+
+def _radar_svg(scores, career):
+    user = _polygon_points(scores)
+    return (f'<svg viewBox="-20 0 400 360" width="100%" xmlns="http://www.w3.org/2000/svg">'
+            f'{_radar_axes()}{_ideal_polygon(career)}'
+            f'<polygon points="{user}" fill="rgba(31,119,180,0.3)" stroke="rgb(31,119,180)"/></svg>'
+            f'<p style="font-size:0.9rem;"><span style="color:rgb(31,119,180);">■</span> Your scores '
+            f'<span style="color:rgb(255,127,14);">■</span> {html.escape(career)} ideal</p>')
+
+
+def _render_chunk(records, out_dir):
+    """Score a chunk of students in one batch and write their reports"""
+    traits = _catalog.traits
+    U = np.array([[record[t] for t in traits] for record in records], dtype=float) / 5.0
+    scores = _matcher.score_batch(U)
+    ranking = np.argsort(-scores, axis=1, kind='stable')
+    tags = _segments.tag_batch(U * 5.0)
+    generated = time.strftime("%Y-%m-%d %H:%M")
+
+    summary = []
+    for record, row, order, tag in zip(records, scores, ranking, tags):
+        top_career = _matcher.careers[order[0]]
+        alternatives = [_matcher.careers[i] for i in order[1:3]]
+        confidence = row[order[0]] * 100
+        trait_scores = {t: record[t] for t in traits}
+        badge = "badge-green" if confidence > 80 else "badge-orange" if confidence > 60 else "badge-red"
+        breakdown = ''.join(f'<div class="trait-score">{html.escape(t.replace("_", " ").title())}: '
+                            f'{trait_scores[t]:g}/5</div>' for t in traits)
+        body = STUDENT_TEMPLATE.substitute(
+            name=html.escape(str(record['name'])),
+            age=html.escape(str(record['age'])),
+            education=html.escape(str(record['education'])),
+            stream=html.escape(str(record['stream'])),
+            top_career=html.escape(top_career),
+            badge=badge,
+            confidence=f"{confidence:.1f}",
+            personality_tag=html.escape(tag),
+            top_details=_career_details(top_career, False),
+            alternatives=''.join(_career_details(c, True) for c in alternatives),
+            radar=_radar_svg([trait_scores[t] for t in traits], top_career),
+            trait_breakdown=breakdown,
+        )
+        filename = f"{record['_row']:05d}_{_slug(record['name'])}.html"
+        page = PAGE_TEMPLATE.substitute(title=f"Career Report - {html.escape(str(record['name']))}",
+                                        body=body, generated=generated)
+        with open(os.path.join(out_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(page)
+        summary.append({
+            'name': record['name'],
+            'file': filename,
+            'top_career': top_career,
+            'alternatives': ', '.join(alternatives),
+            'confidence': round(confidence, 1),
+            'personality_tag': tag,
+            **trait_scores,
+        })
+    return summary
+
+
+def load_cohort(csv_path, traits):
+    """Read and validate a cohort CSV, returning a list of student records"""
+    df = pd.read_csv(csv_path)
+    missing = [c for c in INFO_COLUMNS + traits if c not in df.columns]
+    if missing:
+        raise ValueError(f"Cohort CSV is missing columns: {', '.join(missing)}")
+    answers = df[traits].apply(pd.to_numeric, errors='coerce')
+    bad = answers.isna().any(axis=1) | ((answers < 1) | (answers > 5)).any(axis=1)
+    if bad.any():
+        rows = ', '.join(str(i + 2) for i in np.flatnonzero(bad)[:10])
+        raise ValueError(f"Trait answers must be numbers from 1 to 5 (check CSV lines {rows})")
+    df[traits] = answers
+    df['_row'] = np.arange(len(df))
+    return df[INFO_COLUMNS + traits + ['_row']].to_dict('records')
+
+
+def _summary_page(summary, traits, stats):
+    counts = pd.Series([s['top_career'] for s in summary]).value_counts()
+    averages = pd.DataFrame(summary)[traits].mean()
+    distribution = ''.join(
+        f"<tr><td>{html.escape(career)}</td><td>{count}</td>"
+        f"<td style='width:50%'><div class='bar' style='width:{count / len(summary) * 100:.1f}%'></div></td></tr>"
+        for career, count in counts.items())
+    trait_rows = ''.join(f'<div class="trait-score">{html.escape(t.replace("_", " ").title())}: '
+                         f'{averages[t]:.2f}/5</div>' for t in traits)
+    students = ''.join(
+        f"<tr><td><a href='{html.escape(s['file'])}'>{html.escape(str(s['name']))}</a></td>"
+        f"<td>{html.escape(s['top_career'])}</td><td>{s['confidence']}%</td>"
+        f"<td>{html.escape(s['personality_tag'])}</td></tr>" for s in summary)
+    body = (f"<h1>🎯 Cohort Summary</h1>"
+            f"<p style='text-align:center;'>{len(summary)} students · generated in {stats['seconds']:.1f}s</p>"
+            f"<h3>🏆 Top Career Distribution</h3><table>{distribution}</table>"
+            f"<h3>📊 Average Trait Scores</h3>{trait_rows}"
+            f"<h3>👥 Students</h3><table><tr><th>Name</th><th>Top Career</th><th>Match</th>"
+            f"<th>Personality</th></tr>{students}</table>")
+    return PAGE_TEMPLATE.substitute(title="Cohort Summary", body=body, generated=time.strftime("%Y-%m-%d %H:%M"))
+
+
+def generate_cohort_reports(csv_path, out_dir='reports', workers=None, kernel=None,
+                            catalog_path=None, chunk_size=64, tenant=None):
+    """Render every student's report and the cohort summary, returning run statistics"""
+    start = time.perf_counter()
+    if tenant:
+        config = get_tenant_registry().config
+        if tenant not in config:
+            raise ValueError(f"Unknown tenant '{tenant}'. Available: {', '.join(config) or 'none'}")
+        catalog_path = config[tenant]['catalog']
+    catalog = get_catalog(catalog_path)
+    records = load_cohort(csv_path, catalog.traits)
+    os.makedirs(out_dir, exist_ok=True)
+    # The app's shared segment artifact for this tenant's saved results
+    segments = get_results_segments(tenant_results_path(tenant), catalog.traits).model
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+
+    summary = []
+    if workers == 1 or len(chunks) <= 1:
+        _init_worker(catalog_path, kernel, segments)
+        for chunk in chunks:
+            summary.extend(_render_chunk(chunk, out_dir))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(catalog_path, kernel, segments)) as pool:
+            for rows in pool.map(_render_chunk, chunks, [out_dir] * len(chunks)):
+                summary.extend(rows)
+
+    seconds = time.perf_counter() - start
+    stats = {
+        'students': len(summary),
+        'workers': workers,
+        'seconds': seconds,
+        'reports_per_sec': len(summary) / seconds if seconds > 0 else float('inf'),
+        'summary_path': os.path.join(out_dir, 'index.html'),
+    }
+    if summary:
+        with open(stats['summary_path'], 'w', encoding='utf-8') as f:
+            f.write(_summary_page(summary, catalog.traits, stats))
+        pd.DataFrame(summary).to_csv(os.path.join(out_dir, 'cohort_summary.csv'), index=False)
+    return stats
+
+
+def make_sample_cohort(path, n_students=100, seed=42):
+    """Write a synthetic cohort CSV for trying the generator"""
+    rng = np.random.default_rng(seed)
+    traits = get_catalog().traits
+    df = pd.DataFrame(rng.integers(1, 6, size=(n_students, len(traits))), columns=traits)
+    df.insert(0, 'name', [f"Student {i + 1}" for i in range(n_students)])
+    df.insert(1, 'age', rng.integers(15, 25, size=n_students))
+    df.insert(2, 'education', rng.choice(["High School", "Bachelor's Degree"], size=n_students))
+    df.insert(3, 'stream', rng.choice(["Computer Science", "Business", "Arts", "Science"], size=n_students))
+    df.to_csv(path, index=False)
+    return path
+
+
+def main():
+    """Generate cohort reports from the command line"""
+    parser = argparse.ArgumentParser(description="Generate per-student career reports for a cohort")
+    parser.add_argument('csv', help="cohort CSV with name, age, education, stream and trait columns")
+    parser.add_argument('--out', default='reports', help="output directory (default: reports)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--kernel', default=None, help="matching kernel (default: CAREER_MATCH_KERNEL or l1)")
+    parser.add_argument('--tenant', default=None, help="institution from tenants.json (default: the main catalog)")
+    parser.add_argument('--sample', type=int, metavar='N', help="first write a synthetic cohort of N students")
+    args = parser.parse_args()
+
+    if args.sample:
+        make_sample_cohort(args.csv, args.sample)
+        print(f"✅ Wrote sample cohort of {args.sample} students to {args.csv}")
+
+    stats = generate_cohort_reports(args.csv, args.out, workers=args.workers, kernel=args.kernel, tenant=args.tenant)
+    print(f"✅ Generated {stats['students']} reports with {stats['workers']} workers in {stats['seconds']:.2f}s")
+    print(f"⚡ Throughput: {stats['reports_per_sec']:.1f} reports/sec")
+    print(f"📋 Cohort summary: {stats['summary_path']}")
+
+
+if __name__ == "__main__":
+    main()
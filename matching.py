@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+AI Career Guidance System - Matching Kernels
+============================================
+
+Vectorised career matching over a compiled careers x traits matrix.
+
+Every kernel takes a batch of normalised user scores ``U`` (users x traits,
+0-1, NaN where a trait was not answered), the required trait levels ``R``
+(careers x traits) and the mask ``M`` of traits each career lists, and returns
+a users x careers array of match scores in 0-1. The ``l1`` kernel reproduces
+the original mean ``1 - |user/5 - required|`` rule and is the default.
+
+Usage:
+    python matching.py [--users 10000] [--kernel l1]
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_KERNEL = os.environ.get('CAREER_MATCH_KERNEL', 'l1')
+
+KERNELS = {}
+
+
+def register_kernel(name):
+    """Register a batch matching kernel under the given name"""
+    def decorator(func):
+        KERNELS[name] = func
+        return func
+    return decorator
+
+
+def get_kernel(name):
+    """Look up a registered kernel by name"""
+    try:
+        return KERNELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown matching kernel '{name}'. Available: {', '.join(sorted(KERNELS))}")
+
+
+def compile_trait_matrix(career_database, traits):
+    """Compile required_traits into careers x traits level and mask matrices"""
+    careers = list(career_database)
+    levels = np.zeros((len(careers), len(traits)))
+    mask = np.zeros((len(careers), len(traits)))
+    column = {trait: j for j, trait in enumerate(traits)}
+    for i, career in enumerate(careers):
+        for trait, level in career_database[career]["required_traits"].items():
+            if trait in column:
+                levels[i, column[trait]] = level
+                mask[i, column[trait]] = 1.0
+    return careers, levels, mask
+
+
+def _weighted_distance_score(U, R, W, p):
+    # Unanswered traits drop out of both the numerator and the weight total
+    answered = ~np.isnan(U)
+    U = np.where(answered, U, 0.0)
+    diff = np.abs(U[:, None, :] - R[None, :, :]) ** p
+    weights = W[None, :, :] * answered[:, None, :]
+    total = weights.sum(axis=2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = (weights * diff).sum(axis=2) / total
+    score = 1.0 - mean ** (1.0 / p)
+    return np.where(total > 0, score, 0.0)
+
+
+@register_kernel('l1')
+def l1_kernel(U, R, M):
+    """Mean 1 - |user - required| over the career's listed traits"""
+    return _weighted_distance_score(U, R, M, 1)
+
+
+@register_kernel('l2')
+def l2_kernel(U, R, M):
+    """1 - root mean squared gap over the career's listed traits"""
+    return _weighted_distance_score(U, R, M, 2)
+
+
+@register_kernel('importance_l1')
+def importance_l1_kernel(U, R, M):
+    """L1 match weighted by how strongly the career requires each trait"""
+    return _weighted_distance_score(U, R, R * M, 1)
+
+
+@register_kernel('importance_l2')
+def importance_l2_kernel(U, R, M):
+    """L2 match weighted by how strongly the career requires each trait"""
+    return _weighted_distance_score(U, R, R * M, 2)
+
+
+@register_kernel('cosine')
+def cosine_kernel(U, R, M):
+    """Cosine similarity between the user and the career's trait profile"""
+    answered = ~np.isnan(U)
+    U = np.where(answered, U, 0.0)
+    # Project each career onto the traits the user actually answered
+    R = R * M
+    dot = U @ R.T
+    career_norm = np.sqrt((answered.astype(float) @ (R ** 2).T))
+    user_norm = np.sqrt(U ** 2 @ M.T)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        score = dot / (user_norm * career_norm)
+    return np.nan_to_num(np.clip(score, 0.0, 1.0))
+
+
+class CareerMatcher:
+    """Scores users against a compiled career matrix with a chosen kernel"""
+
+    def __init__(self, career_database, traits, kernel=None):
+        careers, levels, mask = compile_trait_matrix(career_database, list(traits))
+        self._setup(careers, traits, levels, mask, kernel)
+
+    @classmethod
+    def from_matrix(cls, careers, traits, levels, mask, kernel=None):
+        """Build a matcher over an already compiled trait matrix"""
+        matcher = cls.__new__(cls)
+        matcher._setup(careers, traits, levels, mask, kernel)
+        return matcher
+
+    def _setup(self, careers, traits, levels, mask, kernel):
+        self.careers = list(careers)
+        self.traits = list(traits)
+        self.levels = levels
+        self.mask = mask
+        self.kernel_name = kernel or DEFAULT_KERNEL
+        self.kernel = get_kernel(self.kernel_name)
+        self._sensitivity_cache = {}
+        # Matchers are shared by every session in the process
+        self._cache_lock = threading.Lock()
+
+    def to_matrix(self, user_scores):
+        """Turn a list of score dicts into a normalised users x traits array"""
+        return np.array([[scores.get(t, np.nan) for t in self.traits] for scores in user_scores],
+                        dtype=float) / 5.0
+
+    def score_batch(self, U):
+        """Score a normalised users x traits array against every career"""
+        return self.kernel(np.atleast_2d(np.asarray(U, dtype=float)), self.levels, self.mask)
+
+    def score(self, user_scores):
+        """Score a single user's 1-5 answers, returning {career: score}"""
+        row = self.score_batch(self.to_matrix([user_scores]))[0]
+        return dict(zip(self.careers, row.tolist()))
+
+    def sensitivity(self, user_scores, traits=None, top_k=3, cache_size=4096):
+        """Which single +/-1 answer changes would alter the top career or alternatives"""
+        traits = tuple(t for t in (self.traits if traits is None else traits) if t in user_scores)
+        base = tuple(user_scores.get(t) for t in self.traits)
+        cache_key = (base, traits, top_k)
+        with self._cache_lock:
+            cached = self._sensitivity_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Row 0 is the user as answered, then every in-range +/-1 perturbation
+        baseline = self.to_matrix([user_scores])[0] * 5.0
+        rows = [baseline]
+        changes = []
+        for trait in traits:
+            j = self.traits.index(trait)
+            for delta in (-1, 1):
+                value = baseline[j] + delta
+                if 1 <= value <= 5:
+                    row = baseline.copy()
+                    row[j] = value
+                    rows.append(row)
+                    changes.append((trait, int(baseline[j]), int(value)))
+
+        scores = self.score_batch(np.array(rows) / 5.0)
+        ranking = np.argsort(-scores, axis=1, kind='stable')[:, :top_k]
+        base_top, base_alternatives = ranking[0, 0], list(ranking[0, 1:])
+        results = []
+        for (trait, old, new), order, row in zip(changes, ranking[1:], scores[1:]):
+            results.append({
+                'trait': trait,
+                'from': old,
+                'to': new,
+                'top_career': self.careers[order[0]],
+                'alternatives': [self.careers[i] for i in order[1:]],
+                'confidence': float(row[order[0]] * 100),
+                'flips_top': bool(order[0] != base_top),
+                'changes_alternatives': list(order[1:]) != base_alternatives,
+            })
+
+        report = {
+            'top_career': self.careers[base_top],
+            'alternatives': [self.careers[i] for i in base_alternatives],
+            'changes': results,
+        }
+        with self._cache_lock:
+            if len(self._sensitivity_cache) >= cache_size:
+                self._sensitivity_cache.pop(next(iter(self._sensitivity_cache)))
+            self._sensitivity_cache[cache_key] = report
+        return report
+
+
+def benchmark_kernels(career_database, traits, n_users=10000, reference='l1', seed=42):
+    """Compare ranking agreement and per-user latency of every kernel"""
+    rng = np.random.default_rng(seed)
+    U = rng.integers(1, 6, size=(n_users, len(traits))) / 5.0
+    results = {}
+    rankings = {}
+    for name in KERNELS:
+        matcher = CareerMatcher(career_database, traits, kernel=name)
+        matcher.score_batch(U[:10])  # warm up
+        start = time.perf_counter()
+        scores = matcher.score_batch(U)
+        elapsed = time.perf_counter() - start
+        rankings[name] = np.argsort(-scores, axis=1, kind='stable')
+        results[name] = {'us_per_user': elapsed / n_users * 1e6}
+
+    ref = rankings[reference]
+    n_careers = ref.shape[1]
+    ref_rank = np.argsort(ref, axis=1)
+    for name, ranking in rankings.items():
+        rank = np.argsort(ranking, axis=1)
+        # Spearman correlation between career ranks, averaged over users
+        d2 = ((rank - ref_rank) ** 2).sum(axis=1)
+        spearman = 1 - 6 * d2 / (n_careers * (n_careers ** 2 - 1))
+        top3 = [len(set(a[:3]) & set(b[:3])) / 3 for a, b in zip(ranking, ref)]
+        results[name].update({
+            'top1_agreement': float((ranking[:, 0] == ref[:, 0]).mean()),
+            'top3_overlap': float(np.mean(top3)),
+            'spearman': float(spearman.mean()),
+        })
+    return results
+
+
+def main():
+    """Run the kernel benchmark from the command line"""
+    from catalog import get_catalog
+
+    parser = argparse.ArgumentParser(description="Benchmark career matching kernels")
+    parser.add_argument('--users', type=int, default=10000, help="number of simulated users")
+    parser.add_argument('--kernel', default='l1', help="reference kernel for ranking agreement")
+    args = parser.parse_args()
+
+    catalog = get_catalog()
+    results = benchmark_kernels(catalog.careers, catalog.traits, n_users=args.users, reference=args.kernel)
+
+    print(f"🎯 Matching kernel benchmark ({args.users} users, reference: {args.kernel})")
+    print("=" * 72)
+    print(f"{'kernel':<16}{'µs/user':>10}{'top-1 agree':>14}{'top-3 overlap':>16}{'spearman':>12}")
+    for name, r in results.items():
+        print(f"{name:<16}{r['us_per_user']:>10.2f}{r['top1_agreement']:>14.1%}"
+              f"{r['top3_overlap']:>16.1%}{r['spearman']:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
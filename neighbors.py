@@ -0,0 +1,225 @@
+"""
+AI Career Guidance System - Similar Users Index
+===============================================
+
+Nearest-neighbour lookup over the trait columns written by
+``CareerGuidanceSystem.save_results``, used by the results page to show what
+similar past users were recommended.
+
+Quiz answers live on the discrete 1-5 grid, so many users share the exact same
+score tuple. The index stores each distinct tuple once and keeps the saved
+recommendations in per-tuple buckets. New rows are tailed from the results
+file into a pending buffer of at most ``rebuild_threshold`` tuples; when it
+fills, it is merged into a log-structured set of KD-trees whose sizes double
+from level to level (merging equal-sized trees like a binary counter). A
+query therefore touches O(log n) trees plus a constant-size buffer, and each
+tuple is re-indexed O(log n) times overall.
+
+Lookups are cached per (score tuple, k) until the next result is indexed, so
+the reruns of one results page cost a dict lookup.
+"""
+
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+TRAIT_COLUMNS = ["math", "logical_thinking", "creativity", "tech_affinity",
+                 "empathy", "communication", "leadership", "analytical",
+                 "patience", "organization"]
+
+# The only field of another user's result shown on the results page
+PROFILE_COLUMN = 'recommended_career'
+
+# Bytes read at a time by iter_appended
+READ_BLOCK = 4 * 1024 * 1024
+
+
+def _parse_rows(data, columns):
+    text = data.decode('utf-8')
+    if columns is None:
+        frame = pd.read_csv(io.StringIO(text))
+        return frame, list(frame.columns)
+    return pd.read_csv(io.StringIO(text), header=None, names=columns), columns
+
+
+def read_appended(path, offset, size, columns=None):
+    """Rows appended to a results CSV between offset and size, as (frame, new offset, columns)"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        chunk = f.read(size - offset)
+    # Ignore a trailing partial line from a concurrent writer
+    end = chunk.rfind(b'\n') + 1
+    if end == 0:
+        return None, offset, columns
+    frame, columns = _parse_rows(chunk[:end], columns)
+    return frame, offset + end, columns
+
+
+def iter_appended(path, offset, size, columns=None, block_size=READ_BLOCK):
+    """Like read_appended, but yield (frame, new offset, columns) per block of about block_size bytes"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        carry = b''
+        position = offset
+        while position < size:
+            block = f.read(min(block_size, size - position))
+            if not block:
+                break
+            position += len(block)
+            data = carry + block
+            # Only complete lines are parsed; the rest waits for the next block
+            end = data.rfind(b'\n') + 1
+            carry = data[end:]
+            if end == 0:
+                continue
+            frame, columns = _parse_rows(data[:end], columns)
+            offset += end
+            yield frame, offset, columns
+
+
+class ResultsIndex:
+    """Incrementally updated k-nearest-neighbour index over saved results"""
+
+    def __init__(self, path='results.csv', traits=None, rebuild_threshold=256, cache_size=1024):
+        self.path = path
+        self.traits = list(traits or TRAIT_COLUMNS)
+        self.rebuild_threshold = rebuild_threshold
+        self.cache_size = cache_size
+        self._lock = threading.RLock()
+        self._reset()
+        self.refresh()
+
+    def _reset(self):
+        self._columns = None
+        self._offset = 0
+        self._careers = []
+        self._buckets = {}
+        # (keys, KDTree) per level, largest first
+        self._levels = []
+        self._pending = []
+        self._cache = {}
+        self._cache_version = 0
+
+    def __len__(self):
+        return len(self._careers)
+
+    def refresh(self):
+        """Index any rows appended to the results file since the last refresh"""
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                return 0
+            if size < self._offset:
+                # File was truncated or replaced, start over
+                self._reset()
+            if size == self._offset:
+                return 0
+
+            frame, self._offset, self._columns = read_appended(self.path, self._offset, size, self._columns)
+            if frame is None:
+                return 0
+            return self.add_frame(frame)
+
+    def add_frame(self, frame):
+        """Index the rows of a results DataFrame, returning how many were added"""
+        if frame.empty or not set(self.traits).issubset(frame.columns):
+            return 0
+        frame = frame.dropna(subset=self.traits)
+        points = frame[self.traits].to_numpy(dtype=float)
+        careers = (frame[PROFILE_COLUMN].tolist() if PROFILE_COLUMN in frame.columns
+                   else [None] * len(frame))
+
+        with self._lock:
+            for point, career in zip(points, careers):
+                self._add(tuple(point.tolist()), career)
+            if careers:
+                self._maybe_rebuild()
+        return len(careers)
+
+    def add(self, scores, career=None):
+        """Index a single result given its trait scores and recommended career"""
+        key = self._key(scores)
+        with self._lock:
+            self._add(key, career)
+            self._maybe_rebuild()
+
+    def _add(self, key, career):
+        profile_id = len(self._careers)
+        self._careers.append(career)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = [profile_id]
+            self._pending.append(key)
+        else:
+            bucket.append(profile_id)
+
+    def _maybe_rebuild(self):
+        if len(self._pending) < self.rebuild_threshold:
+            return
+        keys, self._pending = self._pending, []
+        # Fold in every smaller level, so level sizes stay strictly decreasing
+        while self._levels and len(self._levels[-1][0]) <= len(keys):
+            keys = self._levels.pop()[0] + keys
+        self._levels.append((keys, KDTree(np.asarray(keys, dtype=float))))
+
+    def _key(self, scores):
+        if isinstance(scores, dict):
+            return tuple(float(scores[t]) for t in self.traits)
+        return tuple(float(s) for s in scores)
+
+    def query(self, scores, k=5):
+        """Recommended careers and distances of the k nearest saved results"""
+        self.refresh()
+        key = self._key(scores)
+        point = np.asarray(key, dtype=float)
+        with self._lock:
+            if self._cache_version != len(self._careers):
+                self._cache.clear()
+                self._cache_version = len(self._careers)
+            cached = self._cache.get((key, k))
+            if cached is not None:
+                return list(cached)
+
+            candidates = []
+            for keys, tree in self._levels:
+                # k distinct tuples always cover at least k profiles
+                dist, idx = tree.query(point.reshape(1, -1), k=min(k, len(keys)))
+                candidates.extend((d, keys[i]) for d, i in zip(dist[0], idx[0]))
+            if self._pending:
+                pending = np.asarray(self._pending, dtype=float)
+                dist = np.sqrt(((pending - point) ** 2).sum(axis=1))
+                candidates.extend(zip(dist, self._pending))
+            candidates.sort(key=lambda c: c[0])
+
+            neighbours = []
+            for distance, neighbour_key in candidates:
+                for profile_id in self._buckets[neighbour_key]:
+                    neighbours.append({PROFILE_COLUMN: self._careers[profile_id], 'distance': float(distance)})
+                    if len(neighbours) == k:
+                        break
+                if len(neighbours) == k:
+                    break
+
+            if len(self._cache) >= self.cache_size:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[(key, k)] = neighbours
+            return list(neighbours)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_results_index(path='results.csv', traits=None):
+    """Return the process-wide index for a results file"""
+    key = os.path.abspath(path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = ResultsIndex(path, traits)
+        return index
@@ -0,0 +1,25 @@
+"""
+AI Career Guidance System - Personality Tags
+============================================
+
+Maps a user's dominant trait to a short personality label.
+"""
+
+PERSONALITY_TAGS = {
+    "creativity": "Creative Thinker",
+    "logical_thinking": "Analytical Mind",
+    "empathy": "People Person",
+    "leadership": "Natural Leader",
+    "tech_affinity": "Tech Enthusiast",
+    "communication": "Great Communicator",
+    "math": "Problem Solver"
+}
+
+DEFAULT_TAG = "Versatile Professional"
+
+
+def personality_tag(scores):
+    """Generate personality tag based on dominant traits"""
+    # Find the highest scoring trait
+    max_trait = max(scores.keys(), key=lambda x: scores[x])
+    return PERSONALITY_TAGS.get(max_trait, DEFAULT_TAG)
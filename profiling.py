@@ -0,0 +1,82 @@
+"""
+AI Career Guidance System - On-Demand Profiling
+===============================================
+
+Profiles a single Streamlit rerun when an admin asks for it, without a
+redeploy. Profiling is only available when ``CAREER_PROFILE_TOKEN`` is set,
+and a rerun is only profiled when the page URL carries
+``?profile=<token>``. With the token unset the app calls ``main()`` directly,
+so there is no overhead.
+
+Profiles are written as ``<timestamp>_<step>.prof`` (pstats format, e.g. for
+snakeviz) to ``CAREER_PROFILE_DIR`` (default ``profiles/``).
+"""
+
+import cProfile
+import hmac
+import os
+import pstats
+import re
+from datetime import datetime
+
+PROFILE_TOKEN = os.environ.get('CAREER_PROFILE_TOKEN')
+PROFILE_DIR = os.environ.get('CAREER_PROFILE_DIR', 'profiles')
+TOP_N = 20
+
+
+def profiling_enabled():
+    """True when an admin token is configured for this deployment"""
+    return bool(PROFILE_TOKEN)
+
+
+def is_authorized(token):
+    """Check a request's token against the configured admin token"""
+    if not PROFILE_TOKEN or not token:
+        return False
+    return hmac.compare_digest(str(token).encode(), PROFILE_TOKEN.encode())
+
+
+def parse_top_n(value, default=TOP_N):
+    """Row count from a query parameter, falling back to default if it is not a positive integer"""
+    try:
+        n = int(value)
+    except (TypeError, ValueError):
+        return default
+    return n if n > 0 else default
+
+
+def top_functions(stats, n=TOP_N, sort='cumulative'):
+    """The n hottest functions from a pstats.Stats as plain rows"""
+    stats.sort_stats(sort)
+    rows = []
+    for func in stats.fcn_list[:n]:
+        _, calls, tottime, cumtime, _ = stats.stats[func]
+        filename, line, name = func
+        rows.append({
+            'function': f"{os.path.basename(filename)}:{line}({name})",
+            'calls': calls,
+            'tottime_ms': round(tottime * 1000, 2),
+            'cumtime_ms': round(cumtime * 1000, 2),
+        })
+    return rows
+
+
+def profile_call(func, label, out_dir=None, top_n=TOP_N):
+    """Run func under cProfile, save the profile and return (path, top rows)
+
+    The profile is saved even if func raises (e.g. Streamlit's rerun
+    exception), and the exception is re-raised afterwards.
+    """
+    out_dir = out_dir or PROFILE_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    path = os.path.join(out_dir, f"{stamp}_{re.sub(r'[^A-Za-z0-9_-]+', '-', str(label))}.prof")
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        func()
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+    return path, top_functions(pstats.Stats(profiler), top_n)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+AI Career Guidance System - Results Replay
+==========================================
+
+Re-scores every saved result in ``results.csv`` with the current matching
+engine, personality segments and ML model, and diffs the output against the
+saved ``recommended_career``, ``confidence_score`` and ``personality_tag``.
+Use it after changing matching logic, the catalog or the model to see how
+many past recommendations would change and how fast the engine runs.
+
+The file is streamed in chunks that are scored in batch across a process
+pool, with a bounded number of chunks in flight, so memory stays flat
+however large the results store grows. Personality segments come from the
+shared segment artifact the app maintains for the same file.
+
+Usage:
+    python replay.py [results.csv] [--kernel l2] [--workers 4] [--diff changes.csv]
+    python replay.py --sample 100000 sample_results.csv
+"""
+
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from catalog import get_catalog
+from segments import SegmentModel, get_results_segments
+
+CHUNK_SIZE = 5000
+CONFIDENCE_TOLERANCE = 0.01
+TIE_TOLERANCE = 1e-9
+DIFF_COLUMNS = ['row', 'saved_career', 'new_career', 'saved_confidence', 'new_confidence',
+                'saved_tag', 'new_tag', 'ml_career']
+
+# Per-process state, set once by _init_worker
+_traits = None
+_matcher = None
+_career_index = None
+_model = None
+_segments = None
+
+
+def _init_worker(catalog_path, kernel, model, segments):
+    global _traits, _matcher, _career_index, _model, _segments
+    catalog = get_catalog(catalog_path)
+    _traits = catalog.traits
+    _matcher = catalog.matcher(kernel)
+    _career_index = {name: i for i, name in enumerate(_matcher.careers)}
+    _model = model
+    _segments = segments
+
+
+def load_model(catalog_path=None):
+    """The (model, scaler) the app would use: the shared artifact, else a fresh fit"""
+    from artifacts import load_model_artifact
+    from training import TRAINING_MODE, get_streamed_model, get_trained_model, get_training_data
+
+    shared = load_model_artifact()
+    if shared is not None:
+        return shared
+    catalog = get_catalog(catalog_path)
+    if TRAINING_MODE == 'streaming':
+        return get_streamed_model(traits=catalog.traits)
+    return get_trained_model(get_training_data(catalog.careers, traits=catalog.traits), catalog.traits)
+
+
+def _replay_chunk(chunk, start_row, keep_diff):
+    """Re-score one chunk of saved results and count disagreements"""
+    answers = chunk[_traits].apply(pd.to_numeric, errors='coerce')
+    valid = answers.notna().all(axis=1).to_numpy()
+    chunk, answers = chunk[valid], answers[valid].to_numpy(dtype=float)
+    rows = np.arange(start_row, start_row + len(valid))[valid]
+
+    saved_careers = chunk['recommended_career'].astype(str).to_numpy()
+    saved_confidence = pd.to_numeric(chunk['confidence_score'], errors='coerce').to_numpy()
+    saved_tags = chunk['personality_tag'].astype(str).to_numpy()
+
+    scores = _matcher.score_batch(answers / 5.0)
+    index = np.arange(len(answers))
+    best = np.argmax(scores, axis=1)
+    best_scores = scores[index, best]
+    saved_index = np.array([_career_index.get(c, -1) for c in saved_careers], dtype=int)
+    # A saved career still tied for first place is not a change
+    career_changed = (saved_index < 0) | (best_scores - scores[index, np.maximum(saved_index, 0)] > TIE_TOLERANCE)
+    new_careers = np.where(career_changed, np.array(_matcher.careers)[best], saved_careers)
+    new_confidence = best_scores * 100
+    new_tags = _segments.tag_batch(answers)
+    if _model is not None and len(answers):
+        model, scaler = _model
+        # The model is trained on the catalog's traits, in catalog order
+        features = pd.DataFrame(answers, columns=_traits)
+        ml_careers = model.predict(scaler.transform(features))
+    else:
+        ml_careers = np.full(len(answers), None)
+
+    confidence_changed = ~(np.abs(new_confidence - saved_confidence) <= CONFIDENCE_TOLERANCE)
+    tag_changed = new_tags != saved_tags
+    ml_disagrees = ml_careers != saved_careers
+
+    result = {
+        'rows': int(len(answers)),
+        'skipped': int((~valid).sum()),
+        'career_changed': int(career_changed.sum()),
+        'confidence_changed': int(confidence_changed.sum()),
+        'tag_changed': int(tag_changed.sum()),
+        'ml_disagrees': int(ml_disagrees.sum()) if _model is not None else 0,
+        'transitions': Counter(zip(saved_careers[career_changed], new_careers[career_changed])),
+        'diff': [],
+    }
+    if keep_diff:
+        changed = career_changed | confidence_changed | tag_changed
+        result['diff'] = [dict(zip(DIFF_COLUMNS, values)) for values in zip(
+            rows[changed], saved_careers[changed], new_careers[changed],
+            saved_confidence[changed].round(2), new_confidence[changed].round(2),
+            saved_tags[changed], new_tags[changed], ml_careers[changed])]
+    return result
+
+
+def _merge(total, result):
+    for key in ('rows', 'skipped', 'career_changed', 'confidence_changed', 'tag_changed', 'ml_disagrees'):
+        total[key] += result[key]
+    total['transitions'].update(result['transitions'])
+    total['diff'].extend(result['diff'])
+
+
+def replay_results(path='results.csv', kernel=None, workers=None, catalog_path=None,
+                   chunk_size=CHUNK_SIZE, diff_path=None, use_model=True):
+    """Replay every saved result, returning disagreement counts, rates and throughput"""
+    start = time.perf_counter()
+    model = load_model(catalog_path) if use_model else None
+    # The app's shared segment artifact for this file; only rows it has not seen are read, in blocks
+    segments = get_results_segments(path, get_catalog(catalog_path).traits).model
+    workers = workers or os.cpu_count() or 1
+    total = {'rows': 0, 'skipped': 0, 'career_changed': 0, 'confidence_changed': 0,
+             'tag_changed': 0, 'ml_disagrees': 0, 'transitions': Counter(), 'diff': []}
+    keep_diff = diff_path is not None
+
+    chunks = pd.read_csv(path, chunksize=chunk_size)
+    if workers == 1:
+        _init_worker(catalog_path, kernel, model, segments)
+        for i, chunk in enumerate(chunks):
+            _merge(total, _replay_chunk(chunk, i * chunk_size, keep_diff))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(catalog_path, kernel, model, segments)) as pool:
+            pending = set()
+            for i, chunk in enumerate(chunks):
+                # Bound the chunks in flight so the file is never fully in memory
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _merge(total, future.result())
+                pending.add(pool.submit(_replay_chunk, chunk, i * chunk_size, keep_diff))
+            for future in pending:
+                _merge(total, future.result())
+
+    seconds = time.perf_counter() - start
+    rows = total['rows']
+    stats = {key: total[key] for key in ('rows', 'skipped', 'career_changed', 'confidence_changed',
+                                         'tag_changed', 'ml_disagrees')}
+    stats.update({
+        'career_change_rate': total['career_changed'] / rows if rows else 0.0,
+        'confidence_change_rate': total['confidence_changed'] / rows if rows else 0.0,
+        'tag_change_rate': total['tag_changed'] / rows if rows else 0.0,
+        'ml_disagreement_rate': total['ml_disagrees'] / rows if rows and use_model else None,
+        'top_transitions': total['transitions'].most_common(5),
+        'workers': workers,
+        'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds > 0 else float('inf'),
+    })
+    if keep_diff:
+        diff = pd.DataFrame(total['diff'], columns=DIFF_COLUMNS).sort_values('row')
+        diff.to_csv(diff_path, index=False)
+        stats['diff_path'] = diff_path
+    return stats
+
+
+def make_sample_results(path, n_rows=10000, seed=42, kernel=None):
+    """Write synthetic results scored by the current engine, for trying the replay"""
+    rng = np.random.default_rng(seed)
+    catalog = get_catalog()
+    answers = rng.integers(1, 6, size=(n_rows, len(catalog.traits)))
+    scores = catalog.matcher(kernel).score_batch(answers / 5.0)
+    best = np.argmax(scores, axis=1)
+    segments = SegmentModel(catalog.traits)
+    segments.partial_fit(answers)
+    df = pd.DataFrame({
+        'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'name': [f"User {i + 1}" for i in range(n_rows)],
+        'age': rng.integers(15, 40, size=n_rows),
+        'education': rng.choice(["High School", "Bachelor's Degree", "Master's Degree"], size=n_rows),
+        'stream': rng.choice(["Computer Science", "Business", "Arts", "Science"], size=n_rows),
+        'recommended_career': np.array(catalog.career_names)[best],
+        'confidence_score': scores[np.arange(n_rows), best] * 100,
+        'personality_tag': segments.tag_batch(answers),
+    })
+    df[catalog.traits] = answers
+    df.to_csv(path, index=False)
+    return path
+
+
+def main():
+    """Replay saved results from the command line"""
+    parser = argparse.ArgumentParser(description="Re-score saved results and report what would change")
+    parser.add_argument('csv', nargs='?', default='results.csv', help="results file (default: results.csv)")
+    parser.add_argument('--kernel', default=None, help="matching kernel (default: CAREER_MATCH_KERNEL or l1)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--diff', metavar='PATH', help="write every changed row to this CSV")
+    parser.add_argument('--no-model', action='store_true', help="skip the ML model comparison")
+    parser.add_argument('--sample', type=int, metavar='N', help="first write N synthetic results to the CSV")
+    args = parser.parse_args()
+
+    if args.sample:
+        make_sample_results(args.csv, args.sample)
+        print(f"✅ Wrote {args.sample} sample results to {args.csv}")
+    if not os.path.exists(args.csv):
+        print(f"❌ No results file at {args.csv}")
+        return
+
+    stats = replay_results(args.csv, kernel=args.kernel, workers=args.workers,
+                           diff_path=args.diff, use_model=not args.no_model)
+    print(f"📊 Replayed {stats['rows']:,} results ({stats['skipped']} skipped) with {stats['workers']} workers")
+    print(f"🎯 Top career changed:   {stats['career_changed']:>8,} ({stats['career_change_rate']:.2%})")
+    print(f"📈 Confidence changed:   {stats['confidence_changed']:>8,} ({stats['confidence_change_rate']:.2%})")
+    print(f"🏷️ Personality changed:  {stats['tag_changed']:>8,} ({stats['tag_change_rate']:.2%})")
+    if stats['ml_disagreement_rate'] is not None:
+        print(f"🤖 ML model disagrees:   {stats['ml_disagrees']:>8,} ({stats['ml_disagreement_rate']:.2%})")
+    for (saved, new), count in stats['top_transitions']:
+        print(f"   {saved} → {new}: {count}")
+    print(f"⏱️ {stats['seconds']:.2f}s · {stats['rows_per_sec']:,.0f} rows/sec")
+    if args.diff:
+        print(f"📋 Changed rows written to {stats['diff_path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,20 +8,40 @@ Perfect for IBM internship demonstration.
 
 Usage:
     python run.py
+    python run.py --workers 4
+    python run.py --no-warm-start
 
 Features:
 - Automatic dependency checking
 - Environment setup
 - Error handling and recovery
 - Performance monitoring
+- Multi-worker mode with a sticky-session proxy and shared model artifacts
+- Warm start: artifacts and the UI stack are ready before the first visitor
 """
 
+import argparse
+import asyncio
+import compileall
 import subprocess
 import sys
 import os
 import importlib.util
+import signal
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
 from pathlib import Path
 
+PROJECT_DIR = Path(__file__).resolve().parent
+
+PUBLIC_PORT = 8501
+WORKER_COOKIE = "career_worker"
+HEALTH_CHECK_INTERVAL = 5
+HEALTH_CHECK_FAILURES = 3
+WORKER_STARTUP_GRACE = 60
+
 def check_python_version():
     """Ensure Python version compatibility"""
     if sys.version_info < (3, 8):
@@ -94,7 +114,84 @@ textColor = "#262730"
             f.write(config_content)
         print("✅ Created Streamlit configuration")
 
-def launch_application():
+class PhaseTimer:
+    """Collects wall-clock timings for named startup phases"""
+
+    def __init__(self):
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def report(self, title):
+        total = sum(seconds for _, seconds in self.phases)
+        print(f"\n⏱️  {title} ({total:.2f}s total)")
+        for name, seconds in self.phases:
+            print(f"   {name:<34}{seconds:>7.2f}s")
+
+def compile_bytecode():
+    """Byte-compile the project modules so workers skip compilation on import"""
+    compileall.compile_dir(str(PROJECT_DIR), maxlevels=0, quiet=1)
+    print("✅ Compiled project bytecode")
+
+def warm_server_process(timer):
+    """Import and prime everything the first request would otherwise pay for"""
+    with timer.phase("UI stack imports"):
+        import pandas  # noqa: F401
+        import plotly.graph_objects as go
+        import sklearn.ensemble  # noqa: F401
+        import streamlit  # noqa: F401
+    with timer.phase("Catalog + model load"):
+        from artifacts import load_model_artifact
+        from catalog import get_catalog
+        from neighbors import get_results_index
+        from segments import get_results_segments
+        from training import DATA_PATH, get_training_data
+        import adaptive_quiz  # noqa: F401
+        catalog = get_catalog()
+        catalog.matcher().score({trait: 3 for trait in catalog.traits})
+        # With a shared model the app never needs the training DataFrame
+        if load_model_artifact() is None:
+            get_training_data(catalog.careers, DATA_PATH, catalog.traits)
+        get_results_index()
+        get_results_segments(traits=catalog.traits)
+        catalog.similarity.related(catalog.career_names[0], k=3)
+    with timer.phase("Chart warm-up"):
+        # Plotly loads its trace validators lazily on first use
+        go.Figure(go.Scatterpolar(r=[1, 2, 1], theta=["a", "b", "a"], fill="toself")).to_json()
+
+def serve_command(port, warm=True, address=None):
+    """Command line that starts one Streamlit server on the given port"""
+    if warm:
+        command = [sys.executable, str(PROJECT_DIR / "run.py"), "--serve", "--port", str(port)]
+        return command + (["--address", address] if address else [])
+    command = [
+        sys.executable, "-m", "streamlit", "run", "app.py",
+        "--server.headless", "true",
+        "--server.port", str(port)
+    ]
+    return command + (["--server.address", address] if address else [])
+
+def serve_worker(port, address=None):
+    """Warm this process, then run the Streamlit server inside it"""
+    timer = PhaseTimer()
+    warm_server_process(timer)
+    timer.report(f"Server warm-up on port {port}")
+
+    from streamlit.web import cli as stcli
+    sys.argv = ["streamlit", "run", str(PROJECT_DIR / "app.py"),
+                "--server.headless", "true",
+                "--server.port", str(port)]
+    if address:
+        sys.argv += ["--server.address", address]
+    sys.exit(stcli.main())
+
+def launch_application(warm=True):
     """Launch the Streamlit application"""
     print("\n🚀 Starting AI Career Guidance System...")
     print("📱 The application will open in your default browser")
@@ -102,11 +199,7 @@ def launch_application():
     print("⏹️  Press Ctrl+C to stop the application\n")
     
     try:
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", "app.py",
-            "--server.headless", "true",
-            "--server.port", "8501"
-        ])
+        subprocess.run(serve_command(PUBLIC_PORT, warm))
     except KeyboardInterrupt:
         print("\n👋 Application stopped by user")
     except FileNotFoundError:
@@ -114,18 +207,276 @@ def launch_application():
         print("Make sure you're running this script from the project root")
         sys.exit(1)
 
+class StickyProxy:
+    """Local reverse proxy that pins each browser to one worker via a cookie"""
+
+    def __init__(self, ports, host="127.0.0.1"):
+        self.ports = list(ports)
+        self.host = host
+        self.healthy = [True] * len(self.ports)
+        self.request_counts = [0] * len(self.ports)
+        self._next_worker = 0
+
+    def choose_worker(self, cookie_header):
+        """Return (worker index, is_new) for a request's Cookie header"""
+        for part in cookie_header.split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == WORKER_COOKIE and value.isdigit():
+                worker = int(value)
+                if worker < len(self.ports) and self.healthy[worker]:
+                    return worker, False
+        # Round-robin new (or orphaned) sessions across healthy workers
+        for _ in range(len(self.ports)):
+            worker = self._next_worker
+            self._next_worker = (self._next_worker + 1) % len(self.ports)
+            if self.healthy[worker]:
+                return worker, True
+        return worker, True
+
+    async def handle(self, client_reader, client_writer):
+        try:
+            head = await client_reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            client_writer.close()
+            return
+
+        lines = head.decode("latin-1").split("\r\n")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        worker, is_new = self.choose_worker(headers.get("cookie", ""))
+
+        if "websocket" not in headers.get("upgrade", "").lower():
+            # One request per connection keeps routing and request counts exact
+            lines = [l for l in lines if not l.lower().startswith(("connection:", "keep-alive:"))]
+            lines.insert(1, "Connection: close")
+        head = "\r\n".join(lines).encode("latin-1")
+
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(self.host, self.ports[worker])
+        except OSError:
+            self.healthy[worker] = False
+            client_writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            await client_writer.drain()
+            client_writer.close()
+            return
+
+        self.request_counts[worker] += 1
+        upstream_writer.write(head)
+        await upstream_writer.drain()
+
+        if is_new:
+            # Pin the browser to this worker for the rest of its session
+            try:
+                response_head = await upstream_reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                client_writer.close()
+                upstream_writer.close()
+                return
+            status, _, rest = response_head.partition(b"\r\n")
+            cookie = f"Set-Cookie: {WORKER_COOKIE}={worker}; Path=/; HttpOnly\r\n".encode("latin-1")
+            client_writer.write(status + b"\r\n" + cookie + rest)
+
+        await asyncio.gather(
+            self._pipe(client_reader, upstream_writer),
+            self._pipe(upstream_reader, client_writer),
+        )
+
+    @staticmethod
+    async def _pipe(reader, writer):
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def serve_forever(self, port):
+        """Run the proxy on the given port (blocks; call from a thread)"""
+        async def serve():
+            server = await asyncio.start_server(self.handle, "0.0.0.0", port)
+            async with server:
+                await server.serve_forever()
+        asyncio.run(serve())
+
+
+class Worker:
+    """One supervised `streamlit run app.py` process"""
+
+    def __init__(self, index, port, env, warm=True):
+        self.index = index
+        self.port = port
+        self.env = env
+        self.warm = warm
+        self.process = None
+        self.restarts = 0
+        self.failures = 0
+        self.started_at = 0.0
+        self.ready = False
+
+    def start(self):
+        log_dir = Path("logs")
+        log_dir.mkdir(exist_ok=True)
+        log = open(log_dir / f"worker-{self.index}.log", "ab")
+        self.process = subprocess.Popen(serve_command(self.port, self.warm, "127.0.0.1"),
+                                        env=self.env, stdout=log, stderr=subprocess.STDOUT)
+        log.close()
+        self.started_at = time.monotonic()
+        self.failures = 0
+        self.ready = False
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def restart(self, reason):
+        print(f"⚠️  Worker {self.index} (port {self.port}) {reason} - restarting")
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    def is_healthy(self):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=2) as response:
+                return response.status == 200
+        except OSError:
+            return False
+
+    def rss_mb(self):
+        """Resident memory in MB (Linux /proc), or None if unavailable"""
+        try:
+            with open(f"/proc/{self.process.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024
+        except (OSError, AttributeError):
+            pass
+        return None
+
+
+def build_shared_artifacts():
+    """Train the model and compile the catalog once for every worker to share"""
+    from artifacts import ARTIFACT_DIR, build_artifacts
+
+    start = time.perf_counter()
+    manifest = build_artifacts()
+    action = "Built" if manifest["built"] else "Reusing"
+    print(f"✅ {action} shared artifacts in {ARTIFACT_DIR}/ "
+          f"({manifest['training_rows']} training rows, {time.perf_counter() - start:.1f}s)")
+    return os.path.abspath(ARTIFACT_DIR)
+
+
+def report_workers(workers, proxy):
+    print(f"📊 {'worker':<8}{'port':>6}{'status':>10}{'RSS MB':>9}{'requests':>10}{'restarts':>10}")
+    for worker in workers:
+        rss = worker.rss_mb()
+        status = "starting" if not worker.ready else "up" if proxy.healthy[worker.index] else "down"
+        print(f"   {worker.index:<8}{worker.port:>6}{status:>10}{(f'{rss:.0f}' if rss else 'n/a'):>9}"
+              f"{proxy.request_counts[worker.index]:>10}{worker.restarts:>10}")
+
+
+def launch_workers(n_workers, report_interval=30, warm=True):
+    """Launch N supervised workers behind the sticky-session proxy"""
+    from artifacts import ARTIFACT_DIR
+
+    env = dict(os.environ, CAREER_ARTIFACT_DIR=os.path.abspath(ARTIFACT_DIR))
+    ports = [PUBLIC_PORT + 1 + i for i in range(n_workers)]
+    workers = [Worker(i, port, env, warm) for i, port in enumerate(ports)]
+    proxy = StickyProxy(ports)
+
+    print(f"\n🚀 Starting {n_workers} workers on ports {ports[0]}-{ports[-1]}...")
+    print(f"🌐 URL: http://localhost:{PUBLIC_PORT}")
+    print("⏹️  Press Ctrl+C to stop the application\n")
+    for worker in workers:
+        worker.start()
+    threading.Thread(target=proxy.serve_forever, args=(PUBLIC_PORT,), daemon=True).start()
+
+    # Stop workers cleanly when the launcher itself is terminated
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    last_report = time.monotonic()
+    try:
+        while True:
+            time.sleep(HEALTH_CHECK_INTERVAL)
+            for worker in workers:
+                if worker.process.poll() is not None:
+                    proxy.healthy[worker.index] = False
+                    worker.restart(f"exited with code {worker.process.returncode}")
+                    continue
+                if worker.is_healthy():
+                    worker.ready = True
+                    worker.failures = 0
+                    proxy.healthy[worker.index] = True
+                    continue
+                if not worker.ready and time.monotonic() - worker.started_at < WORKER_STARTUP_GRACE:
+                    continue
+                worker.failures += 1
+                proxy.healthy[worker.index] = False
+                if worker.failures >= HEALTH_CHECK_FAILURES:
+                    worker.restart(f"failed {worker.failures} health checks")
+            if time.monotonic() - last_report >= report_interval:
+                report_workers(workers, proxy)
+                last_report = time.monotonic()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping workers...")
+    finally:
+        for worker in workers:
+            worker.stop()
+
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Launch the AI Career Guidance System")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of Streamlit worker processes (default: 1)")
+    parser.add_argument("--report-interval", type=int, default=30,
+                        help="seconds between worker status reports in multi-worker mode")
+    parser.add_argument("--no-warm-start", action="store_true",
+                        help="skip prebuilding artifacts and pre-importing the UI stack")
+    # Internal: run one warmed Streamlit server in this process
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=PUBLIC_PORT, help=argparse.SUPPRESS)
+    parser.add_argument("--address", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_worker(args.port, args.address)
+        return
+
+    warm = not args.no_warm_start
     print("🎯 AI Career Guidance System - Launch Script")
     print("=" * 50)
     
     # Pre-flight checks
-    check_python_version()
-    check_dependencies()
-    setup_directories()
+    timer = PhaseTimer()
+    with timer.phase("Python version check"):
+        check_python_version()
+    with timer.phase("Dependency check"):
+        check_dependencies()
+    with timer.phase("Directory setup"):
+        setup_directories()
+    
+    # Warm start: everything the first visitor would otherwise wait for
+    if warm or args.workers > 1:
+        with timer.phase("Bytecode compile"):
+            compile_bytecode()
+        with timer.phase("Data, model + catalog artifacts"):
+            build_shared_artifacts()
+    timer.report("Preflight timing")
     
     # Launch application
-    launch_application()
+    if args.workers > 1:
+        launch_workers(args.workers, report_interval=args.report_interval, warm=warm)
+    else:
+        launch_application(warm)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
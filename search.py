@@ -0,0 +1,169 @@
+"""
+AI Career Guidance System - Career Search
+=========================================
+
+BM25 full-text search over each career's name, description, job roles,
+tools and learning resources. The inverted index is built once when the
+catalog is compiled. Each posting stores its precomputed BM25 weight, so a
+query is a few vectorised adds over the matching postings plus a top-k
+selection, well under a millisecond even for 10k careers.
+
+The last query word also matches as a prefix, so results update sensibly
+while someone is still typing ("pyth" finds Python).
+
+Usage:
+    python search.py --careers 10000 --queries 2000
+"""
+
+import argparse
+import bisect
+import re
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+FIELDS = ['name', 'description', 'job_roles', 'tools', 'learning_resources']
+FIELD_WEIGHTS = {'name': 3, 'job_roles': 2, 'tools': 2, 'description': 1, 'learning_resources': 1}
+STOPWORDS = frozenset("a an and are as at be by for from in into is it of on or that the to with".split())
+MAX_PREFIX_TERMS = 20
+
+
+def tokenize(text):
+    """Lower-cased word tokens without stopwords"""
+    return [t for t in re.findall(r'\w+', str(text).lower()) if t not in STOPWORDS]
+
+
+def _field_text(name, info, field):
+    value = name if field == 'name' else info.get(field, '')
+    return ' '.join(value) if isinstance(value, (list, tuple)) else value
+
+
+class CareerSearchIndex:
+    """Inverted index with precomputed BM25 weights per posting"""
+
+    def __init__(self, careers, k1=1.5, b=0.75, field_weights=None):
+        weights = field_weights or FIELD_WEIGHTS
+        self.names = list(careers)
+        term_freqs = []
+        for name, info in careers.items():
+            tf = Counter()
+            for field in FIELDS:
+                for token in tokenize(_field_text(name, info, field)):
+                    tf[token] += weights.get(field, 1)
+            term_freqs.append(tf)
+
+        lengths = np.array([sum(tf.values()) for tf in term_freqs], dtype=np.float32)
+        avg_length = float(lengths.mean()) if len(lengths) else 1.0
+        postings = defaultdict(lambda: ([], []))
+        for doc, tf in enumerate(term_freqs):
+            norm = k1 * (1 - b + b * lengths[doc] / avg_length)
+            for term, freq in tf.items():
+                ids, parts = postings[term]
+                ids.append(doc)
+                parts.append(freq * (k1 + 1) / (freq + norm))
+
+        n = len(self.names)
+        self.postings = {}
+        for term, (ids, parts) in postings.items():
+            idf = np.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            self.postings[term] = (np.array(ids, dtype=np.int32), np.array(parts, dtype=np.float32) * idf)
+        self.vocabulary = sorted(self.postings)
+
+    def _expand(self, token):
+        """Terms starting with token, for a partially typed last word"""
+        start = bisect.bisect_left(self.vocabulary, token)
+        terms = []
+        for term in self.vocabulary[start:start + MAX_PREFIX_TERMS]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        return terms
+
+    def search(self, query, k=5):
+        """The k best-matching careers for a free-text query, as (career, score) pairs"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        terms = [t for t in tokens[:-1] if t in self.postings]
+        last = tokens[-1]
+        terms.extend([last] if last in self.postings else self._expand(last))
+        if not terms:
+            return []
+
+        scores = np.zeros(len(self.names), dtype=np.float32)
+        for term in terms:
+            ids, weights = self.postings[term]
+            # Document ids are unique within a posting list
+            scores[ids] += weights
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        matched = matched[np.argsort(-scores[matched], kind='stable')]
+        return [(self.names[i], float(scores[i])) for i in matched]
+
+
+def synthetic_careers(careers, n_careers, seed=0):
+    """Expand a catalog to n_careers by recombining existing careers' text"""
+    rng = np.random.default_rng(seed)
+    base = list(careers.values())
+    words = sorted({w for info in base for w in re.findall(r'\w+', info['description'])})
+    synthetic = {}
+    for i in range(n_careers):
+        info = base[i % len(base)]
+        other = base[rng.integers(len(base))]
+        extra = ' '.join(rng.choice(words, size=8))
+        synthetic[f"{list(careers)[i % len(base)]} {i}"] = {
+            'description': f"{info['description']} {extra}",
+            'job_roles': list(info['job_roles']) + list(other['job_roles'][:1]),
+            'tools': list(info['tools']) + list(other['tools'][:2]),
+            'learning_resources': list(info['learning_resources']),
+        }
+    return synthetic
+
+
+def benchmark_search(careers, n_careers=10000, n_queries=2000, seed=0):
+    """Build an index over n_careers and time a batch of mixed queries"""
+    rng = np.random.default_rng(seed)
+    synthetic = synthetic_careers(careers, n_careers, seed)
+    start = time.perf_counter()
+    index = CareerSearchIndex(synthetic)
+    build_seconds = time.perf_counter() - start
+
+    # Draw query words by document frequency, so common (long posting) terms dominate
+    vocabulary = index.vocabulary
+    frequency = np.array([len(index.postings[t][0]) for t in vocabulary], dtype=float)
+    p = frequency / frequency.sum()
+    queries = [' '.join(rng.choice(vocabulary, size=rng.integers(1, 4), p=p)) for _ in range(n_queries)]
+    queries += [term[:3] for term in rng.choice(vocabulary, size=n_queries // 4, p=p)]
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1000
+    return {
+        'careers': n_careers,
+        'terms': len(vocabulary),
+        'queries': len(queries),
+        'build_seconds': build_seconds,
+        'mean_ms': float(timings.mean()),
+        'p99_ms': float(np.percentile(timings, 99)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark career search latency")
+    parser.add_argument('--careers', type=int, default=10000, help="synthetic catalog size")
+    parser.add_argument('--queries', type=int, default=2000, help="number of queries to time")
+    args = parser.parse_args()
+
+    from catalog import get_catalog
+
+    stats = benchmark_search(get_catalog().careers, args.careers, args.queries)
+    print(f"📊 Indexed {stats['careers']:,} careers ({stats['terms']:,} terms) in {stats['build_seconds']:.2f}s")
+    print(f"⏱️ {stats['queries']:,} queries: mean {stats['mean_ms']:.3f} ms, p99 {stats['p99_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+AI Career Guidance System - User Segments
+=========================================
+
+Groups users into personality segments by running mini-batch k-means over
+the trait vectors written by ``CareerGuidanceSystem.save_results``. New rows
+are tailed from the results file and folded into the centroids, so the
+segments keep up with the user base without a refit.
+
+Rows are fitted only in whole ``BATCH_SIZE`` batches taken in file order (a
+partial batch waits for more rows), so the centroids and labels are a pure
+function of the results file: tailing it seven rows at a time and reading it
+in one pass give the same segments. The model and the byte offset it has
+read up to are saved as a shared artifact under
+``<CAREER_ARTIFACT_DIR>/segments/``; every app worker, the replay and the
+cohort report load it and only read the rows appended since, in bounded
+blocks.
+
+A user's segment is the nearest centroid, named after the traits where that
+centroid sits furthest above the average user (e.g. "Tech Enthusiast ·
+Logical Thinking"). Until ``CAREER_SEGMENT_MIN_RESULTS`` results have been
+seen (default 500) the dominant-trait tag from ``personality.py`` is used.
+
+Centroid ids are stable: centres are never randomly reassigned, so a
+segment keeps its identity as it drifts. Labels are fixed when the model
+first becomes ready and only change on an explicit relabel, which is saved
+to the artifact and picked up by every process.
+
+Usage:
+    python segments.py [results.csv] [--relabel]
+    python segments.py --benchmark --rows 1000000
+"""
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+
+from artifacts import ARTIFACT_DIR, atomic_write, file_signature
+from neighbors import TRAIT_COLUMNS, iter_appended
+from personality import DEFAULT_TAG, PERSONALITY_TAGS, personality_tag
+
+N_SEGMENTS = int(os.environ.get('CAREER_SEGMENTS', 8))
+MIN_SEGMENT_RESULTS = int(os.environ.get('CAREER_SEGMENT_MIN_RESULTS', 500))
+# Divides the default MIN_SEGMENT_RESULTS, so labels are set right at 500 results
+BATCH_SIZE = 250
+ASSIGN_CHUNK = 65536
+
+# Names for traits that have no dominant-trait tag of their own
+SEGMENT_NAMES = dict(PERSONALITY_TAGS, analytical="Detail Analyst",
+                     patience="Steady Supporter", organization="Organized Planner")
+
+
+def trait_title(trait):
+    return trait.replace('_', ' ').title()
+
+
+class SegmentModel:
+    """Streaming k-means over trait vectors with nearest-centroid assignment"""
+
+    def __init__(self, traits=None, n_segments=N_SEGMENTS, min_results=MIN_SEGMENT_RESULTS, seed=0):
+        self.traits = list(traits or TRAIT_COLUMNS)
+        self.n_segments = n_segments
+        self.min_results = min_results
+        self.seed = seed
+        self.kmeans = MiniBatchKMeans(n_segments, batch_size=BATCH_SIZE, n_init=1,
+                                      reassignment_ratio=0.0, random_state=seed)
+        self.n_seen = 0
+        self.n_fitted = 0
+        self._sum = np.zeros(len(self.traits))
+        # Rows waiting for a full batch
+        self._pending = np.empty((0, len(self.traits)))
+        # (centers, squared norms, labels), swapped as one so readers never mix versions
+        self._state = None
+        self.labels_version = 0
+        self.sizes = np.zeros(n_segments, dtype=np.int64)
+
+    @property
+    def params(self):
+        """Everything besides the rows that the fitted segments depend on"""
+        return (tuple(self.traits), self.n_segments, self.min_results, self.seed, BATCH_SIZE)
+
+    @property
+    def centers(self):
+        return None if self._state is None else self._state[0]
+
+    @property
+    def labels(self):
+        return [] if self._state is None else self._state[2]
+
+    @property
+    def ready(self):
+        return self._state is not None and bool(self._state[2])
+
+    def partial_fit(self, X):
+        """Queue trait vectors (1-5 scale) and fold every full batch into the centroids"""
+        X = np.asarray(X, dtype=float).reshape(-1, len(self.traits))
+        if not len(X):
+            return 0
+        self.n_seen += len(X)
+        rows = np.vstack([self._pending, X])
+        n_full = len(rows) - len(rows) % BATCH_SIZE
+        self._pending = rows[n_full:].copy()
+        # Same batches whatever the call sizes, so the result only depends on the rows
+        for start in range(0, n_full, BATCH_SIZE):
+            self._fit_batch(rows[start:start + BATCH_SIZE])
+        return len(X)
+
+    def _fit_batch(self, batch):
+        self.kmeans.partial_fit(batch)
+        self.n_fitted += len(batch)
+        self._sum += batch.sum(axis=0)
+        self._set_centers(self.kmeans.cluster_centers_)
+        self.sizes += np.bincount(self.assign_batch(batch), minlength=self.n_segments)
+
+    def _set_centers(self, centers):
+        centers = np.array(centers, dtype=float)
+        labels = self.labels
+        if not labels and self.n_fitted >= self.min_results:
+            labels = self._label_centers(centers)
+        self._state = (centers, (centers ** 2).sum(axis=1), labels)
+
+    def relabel(self):
+        """Rename every segment from its current centroid (saved tags may change)"""
+        if self._state is None:
+            raise ValueError(f"No segments to relabel yet ({self.n_seen} results seen)")
+        centers, center_sq, _ = self._state
+        self._state = (centers, center_sq, self._label_centers(centers))
+        self.labels_version += 1
+
+    def use_labels(self, other):
+        """Take the labels of a model fitted on the same rows or a prefix of them"""
+        if self._state is not None and other.labels:
+            centers, center_sq, _ = self._state
+            self._state = (centers, center_sq, list(other.labels))
+            self.labels_version = other.labels_version
+
+    def _label_centers(self, centers):
+        mean = self._sum / max(self.n_fitted, 1)
+        labels, used = [], {}
+        for deviation in centers - mean:
+            order = np.argsort(-deviation, kind='stable')
+            first, second = (self.traits[i] for i in order[:2])
+            if deviation[order[0]] <= 0:
+                label = DEFAULT_TAG
+            elif deviation[order[1]] <= 0:
+                label = SEGMENT_NAMES.get(first, trait_title(first))
+            else:
+                label = f"{SEGMENT_NAMES.get(first, trait_title(first))} · {trait_title(second)}"
+            used[label] = used.get(label, 0) + 1
+            labels.append(label if used[label] == 1 else f"{label} ({used[label]})")
+        return labels
+
+    def assign(self, scores):
+        """Nearest segment for one user's trait scores (dict or sequence)"""
+        if isinstance(scores, dict):
+            scores = [scores[t] for t in self.traits]
+        centers, center_sq, _ = self._state
+        x = np.asarray(scores, dtype=float)
+        # |x - c|^2 without the |x|^2 term, which is the same for every centre
+        return int(np.argmin(center_sq - 2 * (centers @ x)))
+
+    def assign_batch(self, X):
+        """Nearest segment for every row of an (n, traits) array"""
+        centers, center_sq, _ = self._state
+        X = np.asarray(X, dtype=float).reshape(-1, len(self.traits))
+        out = np.empty(len(X), dtype=np.int64)
+        for start in range(0, len(X), ASSIGN_CHUNK):
+            block = X[start:start + ASSIGN_CHUNK]
+            out[start:start + len(block)] = np.argmin(center_sq - 2 * (block @ centers.T), axis=1)
+        return out
+
+    def tag(self, scores):
+        """Segment label for a full set of answers, else the dominant-trait tag"""
+        labels = self.labels
+        if labels and all(t in scores for t in self.traits):
+            return labels[self.assign(scores)]
+        return personality_tag(scores)
+
+    def tag_batch(self, X):
+        """Segment labels for every row of an (n, traits) array"""
+        X = np.asarray(X, dtype=float).reshape(-1, len(self.traits))
+        labels = self.labels
+        if not labels:
+            return np.array([personality_tag(dict(zip(self.traits, row))) for row in X], dtype=object)
+        return np.array(labels, dtype=object)[self.assign_batch(X)]
+
+    def summary(self):
+        """Per-segment label, share of users and centroid"""
+        total = max(int(self.sizes.sum()), 1)
+        return [{'segment': i, 'label': self.labels[i], 'users': int(self.sizes[i]),
+                 'share': self.sizes[i] / total, 'center': dict(zip(self.traits, self.centers[i].round(2)))}
+                for i in range(len(self.labels))]
+
+
+def segments_artifact_path(path, artifact_dir=None):
+    """Where the shared segment model for a results file is saved"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:10]
+    return os.path.join(artifact_dir or ARTIFACT_DIR, 'segments', f"{name}-{digest}.joblib")
+
+
+class ResultsSegments:
+    """Segment model kept up to date with a results file and shared through its artifact"""
+
+    def __init__(self, path='results.csv', traits=None, artifact_dir=None, **kwargs):
+        self.path = path
+        self.traits = list(traits or TRAIT_COLUMNS)
+        self.artifact_path = segments_artifact_path(path, artifact_dir)
+        self._kwargs = kwargs
+        self._lock = threading.Lock()
+        self._artifact_signature = None
+        self._reset()
+        self.refresh()
+
+    def _reset(self):
+        self.model = SegmentModel(self.traits, **self._kwargs)
+        self._offset = 0
+        self._columns = None
+
+    def _load_artifact(self, size):
+        # Another process may have read further, or relabelled
+        signature = file_signature(self.artifact_path)
+        if signature is None or signature == self._artifact_signature:
+            return
+        self._artifact_signature = signature
+        try:
+            saved = joblib.load(self.artifact_path)
+        except OSError:
+            return
+        # Ignore artifacts for other settings or for a file that has since been truncated
+        if saved['model'].params != self.model.params or saved['offset'] > size:
+            return
+        if saved['offset'] >= self._offset:
+            self.model, self._offset, self._columns = saved['model'], saved['offset'], saved['columns']
+        elif saved['model'].labels_version > self.model.labels_version:
+            self.model.use_labels(saved['model'])
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.artifact_path), exist_ok=True)
+        saved = {'model': self.model, 'offset': self._offset, 'columns': self._columns}
+        atomic_write(self.artifact_path, lambda p: joblib.dump(saved, p))
+        self._artifact_signature = file_signature(self.artifact_path)
+
+    def refresh(self):
+        """Fold any rows appended to the results file since the artifact or the last refresh"""
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                return 0
+            if size < self._offset:
+                # File was truncated or replaced, start over
+                self._reset()
+            self._load_artifact(size)
+            if size == self._offset:
+                return 0
+            added, start = 0, self._offset
+            for frame, self._offset, self._columns in iter_appended(self.path, self._offset, size, self._columns):
+                if not set(self.traits).issubset(frame.columns):
+                    continue
+                points = frame[self.traits].apply(pd.to_numeric, errors='coerce').dropna()
+                added += self.model.partial_fit(points.to_numpy(dtype=float))
+            if self._offset != start:
+                self._save()
+            return added
+
+    def relabel(self):
+        """Rename the segments from the current centroids and share the names with every process"""
+        self.refresh()
+        with self._lock:
+            self.model.relabel()
+            self._save()
+        return self.model.labels
+
+    def tag(self, scores):
+        """Current segment label for one user's scores"""
+        self.refresh()
+        return self.model.tag(scores)
+
+
+_segments = {}
+_segments_lock = threading.Lock()
+
+
+def get_results_segments(path='results.csv', traits=None, artifact_dir=None):
+    """Return the process-wide segment model for a results file"""
+    key = (os.path.abspath(path), segments_artifact_path(path, artifact_dir))
+    with _segments_lock:
+        segments = _segments.get(key)
+        if segments is None:
+            segments = _segments[key] = ResultsSegments(path, traits, artifact_dir)
+        return segments
+
+
+def synthetic_results(careers, traits, n_rows, seed=0):
+    """Trait vectors scattered around the catalog's career profiles, on the 1-5 grid"""
+    rng = np.random.default_rng(seed)
+    profiles = np.array([[info['required_traits'].get(t, 0.5) * 5 for t in traits] for info in careers.values()])
+    points = profiles[rng.integers(len(profiles), size=n_rows)] + rng.normal(0, 0.8, size=(n_rows, len(traits)))
+    return np.clip(np.rint(points), 1, 5)
+
+
+def benchmark_segments(careers, traits, n_rows=1_000_000, n_lookups=10000, seed=0):
+    """Time streaming updates, single lookups and bulk assignment over n_rows results"""
+    X = synthetic_results(careers, traits, n_rows, seed)
+    model = SegmentModel(traits, min_results=0, seed=seed)
+
+    start = time.perf_counter()
+    for i in range(0, n_rows, BATCH_SIZE):
+        model.partial_fit(X[i:i + BATCH_SIZE])
+    update_seconds = time.perf_counter() - start
+
+    # One result at a time, as the app folds in each saved result
+    single = X[:1000]
+    start = time.perf_counter()
+    for row in single:
+        model.partial_fit(row)
+    single_update_us = (time.perf_counter() - start) / len(single) * 1e6
+
+    lookups = [dict(zip(traits, row)) for row in X[:n_lookups]]
+    start = time.perf_counter()
+    for scores in lookups:
+        model.assign(scores)
+    assign_us = (time.perf_counter() - start) / len(lookups) * 1e6
+
+    start = time.perf_counter()
+    segments = model.assign_batch(X)
+    batch_seconds = time.perf_counter() - start
+
+    inertia = float(((X - model.centers[segments]) ** 2).sum(axis=1).mean())
+    return {
+        'rows': n_rows,
+        'segments': model.summary(),
+        'update_seconds': update_seconds,
+        'update_rows_per_sec': n_rows / update_seconds,
+        'single_update_us': single_update_us,
+        'assign_us': assign_us,
+        'batch_seconds': batch_seconds,
+        'batch_rows_per_sec': n_rows / batch_seconds,
+        'inertia': inertia,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or benchmark user segments")
+    parser.add_argument('csv', nargs='?', default='results.csv', help="results file (default: results.csv)")
+    parser.add_argument('--relabel', action='store_true', help="rename the segments from their current centroids")
+    parser.add_argument('--benchmark', action='store_true', help="time updates and assignment on synthetic results")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="synthetic results for --benchmark")
+    args = parser.parse_args()
+
+    from catalog import get_catalog
+
+    catalog = get_catalog()
+    if args.benchmark:
+        stats = benchmark_segments(catalog.careers, catalog.traits, args.rows)
+        print(f"📊 Segmented {stats['rows']:,} results into {len(stats['segments'])} segments")
+        print(f"⏱️ Streaming update: {stats['update_seconds']:.2f}s ({stats['update_rows_per_sec']:,.0f} rows/sec), "
+              f"{stats['single_update_us']:.0f} µs per single result")
+        print(f"⏱️ Assignment: {stats['assign_us']:.1f} µs per user, "
+              f"{stats['batch_seconds']:.2f}s batch ({stats['batch_rows_per_sec']:,.0f} rows/sec)")
+        print(f"🎯 Mean squared distance to centre: {stats['inertia']:.2f}")
+        segments = stats['segments']
+    else:
+        if not os.path.exists(args.csv):
+            print(f"❌ No results file at {args.csv}")
+            return
+        segments = get_results_segments(args.csv, catalog.traits)
+        if args.relabel:
+            try:
+                labels = segments.relabel()
+            except ValueError as e:
+                print(f"❌ {e}")
+                return
+            print(f"🏷️ Relabelled {len(labels)} segments; every worker picks up the new names")
+        model = segments.model
+        if not model.ready:
+            print(f"⚠️ {model.n_seen} results seen; segments start at {model.min_results}")
+            return
+        print(f"📊 {model.n_seen:,} results in {model.n_segments} segments")
+        segments = model.summary()
+    for segment in sorted(segments, key=lambda s: -s['users']):
+        print(f"   {segment['label']:<45} {segment['share']:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+AI Career Guidance System - Session Memory
+==========================================
+
+Keeps heavy per-session objects (the guidance system and anything else
+expensive) out of ``st.session_state`` in a process-wide registry with
+TTL-based eviction. Sessions themselves hold only compact state - the step,
+user info and score tuple - so an evicted session that comes back simply
+rebuilds its heavy objects from the shared, already-loaded artifacts.
+
+Concurrent reruns of one session share a single build of each heavy object.
+Per-session memory is estimated for monitoring; set ``CAREER_SESSION_STATS``
+to a file path to have the registry write those numbers as JSON on sweep.
+"""
+
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from singleflight import get_flight
+
+SESSION_TTL = int(os.environ.get('CAREER_SESSION_TTL', 900))
+SWEEP_INTERVAL = 30
+STATS_PATH = os.environ.get('CAREER_SESSION_STATS')
+
+
+def deep_sizeof(obj, exclude=(), _seen=None):
+    """Approximate bytes reachable from obj, skipping objects listed in exclude"""
+    seen = _seen if _seen is not None else {id(o) for o in exclude}
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes if obj.base is None else sys.getsizeof(obj)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, exclude, seen) + deep_sizeof(v, exclude, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, exclude, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_sizeof(vars(obj), exclude, seen)
+    return size
+
+
+class SessionRegistry:
+    """Per-session heavy objects with idle-time eviction"""
+
+    def __init__(self, ttl=SESSION_TTL, sweep_interval=SWEEP_INTERVAL, stats_path=STATS_PATH):
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.stats_path = stats_path
+        self._lock = threading.Lock()
+        self._sessions = {}
+        # Weak, so replaced training data and evicted models are not kept alive
+        self._shared = weakref.WeakValueDictionary()
+        self._swept_at = time.monotonic()
+        self.evictions = 0
+        self.rebuilds = 0
+
+    def mark_shared(self, *objects):
+        """Exclude process-wide objects (model, training data) from per-session bytes"""
+        with self._lock:
+            for obj in objects:
+                if obj is not None:
+                    try:
+                        self._shared[id(obj)] = obj
+                    except TypeError:
+                        # Not weak-referenceable; leave it counted per session
+                        pass
+
+    def touch(self, session_key, compact_state=None):
+        """Mark a session active and record its compact state size"""
+        with self._lock:
+            entry = self._sessions.setdefault(session_key, {'objects': {}, 'compact_bytes': 0})
+            entry['last_seen'] = time.monotonic()
+            if compact_state is not None:
+                entry['compact_bytes'] = len(pickle.dumps(compact_state))
+        self.maybe_sweep()
+
+    def get(self, session_key, name, factory):
+        """Return a session's heavy object, building it if missing or evicted"""
+        with self._lock:
+            entry = self._sessions.setdefault(session_key, {'objects': {}, 'compact_bytes': 0})
+            entry['last_seen'] = time.monotonic()
+            obj = entry['objects'].get(name)
+        if obj is not None:
+            return obj
+
+        def build():
+            with self._lock:
+                obj = entry['objects'].get(name)
+            if obj is None:
+                obj = factory()
+                with self._lock:
+                    entry['objects'][name] = obj
+                    if entry.pop('evicted', False):
+                        self.rebuilds += 1
+            return obj
+
+        # Two reruns of the same session arriving together build it once
+        return get_flight('session').do((session_key, name), build)
+
+    def maybe_sweep(self):
+        if time.monotonic() - self._swept_at >= self.sweep_interval:
+            self.sweep()
+
+    def sweep(self, now=None):
+        """Drop heavy objects of idle sessions and forget long-gone ones"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._swept_at = now
+            for key in list(self._sessions):
+                entry = self._sessions[key]
+                idle = now - entry['last_seen']
+                if idle >= 4 * self.ttl:
+                    del self._sessions[key]
+                elif idle >= self.ttl and entry['objects']:
+                    entry['objects'] = {}
+                    entry['evicted'] = True
+                    self.evictions += 1
+        if self.stats_path:
+            self.write_stats(self.stats_path)
+
+    def stats(self):
+        """Per-session idle time and estimated bytes (shared objects excluded)"""
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._sessions.items())
+            shared = list(self._shared.values())
+        sessions = {}
+        for key, entry in entries:
+            heavy = sum(deep_sizeof(obj, exclude=shared) for obj in entry['objects'].values())
+            sessions[key] = {
+                'idle_seconds': round(now - entry['last_seen'], 1),
+                'compact_bytes': entry['compact_bytes'],
+                'heavy_bytes': heavy,
+                'total_bytes': entry['compact_bytes'] + heavy,
+            }
+        return {
+            'sessions': sessions,
+            'active_sessions': sum(1 for _, e in entries if e['objects']),
+            'evictions': self.evictions,
+            'rebuilds': self.rebuilds,
+            'total_bytes': sum(s['total_bytes'] for s in sessions.values()),
+        }
+
+    def write_stats(self, path):
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.stats(), f, indent=2)
+        os.replace(tmp, path)
+
+
+_registry = SessionRegistry()
+
+
+def get_session_registry():
+    """Return the process-wide session registry"""
+    return _registry
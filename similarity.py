@@ -0,0 +1,171 @@
+"""
+AI Career Guidance System - Career Similarity
+=============================================
+
+Precomputes how similar every career is to every other career from its
+``required_traits`` (cosine over the trait vector), ``tools`` (Jaccard over
+tool names) and ``job_roles`` (Jaccard over role words). Only each career's
+top neighbours are kept, so looking up related careers is a dict access.
+
+When a single catalog entry changes only that career's row is recomputed
+and the neighbour lists it enters or leaves are patched, instead of
+recomputing the full careers x careers matrix.
+"""
+
+import copy
+import re
+
+import numpy as np
+from scipy import sparse
+
+NEIGHBOR_K = 10
+WEIGHTS = {'traits': 0.6, 'tools': 0.25, 'job_roles': 0.15}
+BLOCK_SIZE = 1024
+
+
+def tool_tokens(info):
+    return frozenset(tool.strip().lower() for tool in info['tools'])
+
+
+def role_tokens(info):
+    return frozenset(word.lower() for role in info['job_roles'] for word in re.findall(r'\w+', role))
+
+
+def _incidence(token_sets):
+    """Sparse careers x tokens 0/1 matrix for a list of token sets"""
+    vocab = {}
+    rows, cols = [], []
+    for i, tokens in enumerate(token_sets):
+        for token in tokens:
+            rows.append(i)
+            cols.append(vocab.setdefault(token, len(vocab)))
+    data = np.ones(len(rows), dtype=np.float32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(token_sets), max(len(vocab), 1)))
+
+
+def _jaccard_block(B, sizes, block):
+    inter = (B[block] @ B.T).toarray()
+    union = sizes[block][:, None] + sizes[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+class CareerSimilarity:
+    """Top-k related careers for every career in a catalog"""
+
+    def __init__(self, careers, traits, k=NEIGHBOR_K, weights=None):
+        self.traits = list(traits)
+        self.k = k
+        self.weights = dict(weights or WEIGHTS)
+        self.names = list(careers)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        features = [self._features(info) for info in careers.values()]
+        self._vectors = np.array([f[0] for f in features], dtype=np.float32).reshape(len(self.names), len(self.traits))
+        self._tools = [f[1] for f in features]
+        self._roles = [f[2] for f in features]
+        self.neighbors = {}
+        self.row_updates = 0
+        self._build()
+
+    def _features(self, info):
+        vector = np.array([info['required_traits'].get(t, 0.0) for t in self.traits], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector), tool_tokens(info), role_tokens(info)
+
+    def _build(self):
+        """Full blockwise build; memory stays O(block x careers)"""
+        tools, roles = _incidence(self._tools), _incidence(self._roles)
+        tool_sizes = np.asarray(tools.sum(axis=1), dtype=np.float32).ravel()
+        role_sizes = np.asarray(roles.sum(axis=1), dtype=np.float32).ravel()
+        for start in range(0, len(self.names), BLOCK_SIZE):
+            block = np.arange(start, min(start + BLOCK_SIZE, len(self.names)))
+            S = (self.weights['traits'] * (self._vectors[block] @ self._vectors.T)
+                 + self.weights['tools'] * _jaccard_block(tools, tool_sizes, block)
+                 + self.weights['job_roles'] * _jaccard_block(roles, role_sizes, block))
+            for row, i in enumerate(block):
+                self._set_neighbors(i, S[row])
+
+    def _row_similarity(self, i):
+        """Similarity of career i to every career, O(careers)"""
+        tools, roles = self._tools[i], self._roles[i]
+        tool_sim = [len(tools & other) / len(tools | other) if tools | other else 0.0 for other in self._tools]
+        role_sim = [len(roles & other) / len(roles | other) if roles | other else 0.0 for other in self._roles]
+        self.row_updates += 1
+        return (self.weights['traits'] * (self._vectors @ self._vectors[i])
+                + self.weights['tools'] * np.array(tool_sim, dtype=np.float32)
+                + self.weights['job_roles'] * np.array(role_sim, dtype=np.float32))
+
+    def _set_neighbors(self, i, sims):
+        sims = np.array(sims, dtype=np.float32)
+        sims[i] = -np.inf
+        k = min(self.k, len(self.names) - 1)
+        if k <= 0:
+            self.neighbors[self.names[i]] = []
+            return
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top], kind='stable')]
+        self.neighbors[self.names[i]] = [(self.names[j], float(sims[j])) for j in top]
+
+    def related(self, name, k=5):
+        """The k careers most similar to name, as (career, similarity) pairs"""
+        return self.neighbors.get(name, [])[:k]
+
+    def similarity(self, a, b):
+        """Pairwise similarity between two careers (computed on demand)"""
+        return float(self._row_similarity(self.index[a])[self.index[b]])
+
+    def update(self, name, info):
+        """Add or replace one career, patching only the affected neighbour lists"""
+        vector, tools, roles = self._features(info)
+        if name in self.index:
+            i = self.index[name]
+            self._vectors[i] = vector
+            self._tools[i], self._roles[i] = tools, roles
+        else:
+            i = len(self.names)
+            self.names.append(name)
+            self.index[name] = i
+            self._vectors = np.vstack([self._vectors, vector[None, :]])
+            self._tools.append(tools)
+            self._roles.append(roles)
+        sims = self._row_similarity(i)
+        self._set_neighbors(i, sims)
+        for j, other in enumerate(self.names):
+            if j != i:
+                self._patch(j, other, name, float(sims[j]))
+
+    def _patch(self, j, other, name, sim):
+        stored = self.neighbors[other]
+        old = next((s for n, s in stored if n == name), None)
+        current = [pair for pair in stored if pair[0] != name]
+        if old is not None and sim < old and len(self.names) - 1 > self.k:
+            # name may now rank below careers outside the stored top-k
+            self._set_neighbors(j, self._row_similarity(j))
+            return
+        if old is None and len(current) >= self.k and sim <= current[-1][1]:
+            return
+        current.append((name, sim))
+        current.sort(key=lambda pair: -pair[1])
+        self.neighbors[other] = current[:self.k]
+
+    def remove(self, name):
+        """Drop one career, refilling only the lists it appeared in"""
+        i = self.index.pop(name)
+        del self.names[i]
+        self._vectors = np.delete(self._vectors, i, axis=0)
+        del self._tools[i], self._roles[i]
+        del self.neighbors[name]
+        self.index = {n: j for j, n in enumerate(self.names)}
+        for j, other in enumerate(self.names):
+            if any(pair[0] == name for pair in self.neighbors[other]):
+                self._set_neighbors(j, self._row_similarity(j))
+
+    def with_changes(self, old_careers, new_careers):
+        """Copy of this index updated for the entries that differ between two catalogs"""
+        updated = copy.deepcopy(self)
+        for name in old_careers:
+            if name not in new_careers:
+                updated.remove(name)
+        for name, info in new_careers.items():
+            if old_careers.get(name) != info:
+                updated.update(name, info)
+        return updated
@@ -0,0 +1,104 @@
+"""
+AI Career Guidance System - Single-Flight Loads
+===============================================
+
+Coalesces concurrent requests for the same expensive computation: the first
+caller for a key runs it, and every caller that arrives while it is in
+flight waits for that one execution and shares its result or exception.
+Nothing is cached once the call finishes; callers keep their own caches and
+use this only on a miss.
+
+Waiters give up after ``CAREER_LOAD_TIMEOUT`` seconds (default 120) with a
+TimeoutError; the in-flight call itself keeps running for later callers.
+Per-group counters (executions, coalesced calls, errors, timeouts) are
+available from ``flight_stats()``.
+"""
+
+import os
+import threading
+
+LOAD_TIMEOUT = float(os.environ.get('CAREER_LOAD_TIMEOUT', 120))
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one in-flight execution per key"""
+
+    def __init__(self, name, timeout=LOAD_TIMEOUT):
+        self.name = name
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    def do(self, key, fn, timeout=None):
+        """Return fn()'s result, sharing one execution among concurrent callers of key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                with self._lock:
+                    self.errors += 1
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+        elif not call.event.wait(self.timeout if timeout is None else timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise TimeoutError(f"Timed out waiting for in-flight {self.name} load of {key!r}")
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'errors': self.errors,
+                'timeouts': self.timeouts,
+                'in_flight': len(self._calls),
+            }
+
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def get_flight(name):
+    """Return the process-wide single-flight group for name"""
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = _groups[name] = SingleFlight(name)
+        return group
+
+
+def flight_stats():
+    """Counters for every single-flight group in this process"""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
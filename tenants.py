@@ -0,0 +1,222 @@
+"""
+AI Career Guidance System - Tenants
+===================================
+
+Serves several institutions from one deployment, each with its own careers
+and quiz questions. Tenants are listed in ``tenants.json`` (or YAML, set
+``CAREER_TENANTS``)::
+
+    {"tenants": {"acme": {"catalog": "tenants/acme.json"},
+                 "westfield": {"catalog": "tenants/westfield.yaml",
+                               "training_data": "tenants/westfield_data.csv"}}}
+
+A session picks its tenant with ``?tenant=acme`` in the URL; otherwise
+``CAREER_TENANT`` applies, and the built-in ``default`` tenant is the normal
+``catalog.json`` deployment.
+
+Each tenant's catalog compiles into its own trait matrix and model artifact
+under ``artifacts/tenants/<name>/``. Loaded tenants live in an LRU bounded
+by ``CAREER_TENANT_CACHE_MB`` (estimated bytes) and ``CAREER_MAX_TENANTS``;
+the least recently used tenant is evicted first and rebuilt from its
+on-disk artifacts when it comes back. Sessions look the model up here on
+every use rather than keeping their own reference, so eviction frees it.
+Editing a tenant's catalog rebuilds that tenant's model on the next lookup.
+
+Hits and misses are counted once per page request (``request``), alongside
+load latency, for monitoring.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from artifacts import ARTIFACT_DIR, MODEL_FILE, build_artifacts, read_manifest, read_model_artifact
+from catalog import CatalogStore, get_catalog, load_catalog_file
+from sessions import deep_sizeof
+from singleflight import get_flight
+
+TENANT_CONFIG_PATH = os.environ.get('CAREER_TENANTS', 'tenants.json')
+DEFAULT_TENANT = 'default'
+SELECTED_TENANT = os.environ.get('CAREER_TENANT', DEFAULT_TENANT)
+TENANT_CACHE_MB = float(os.environ.get('CAREER_TENANT_CACHE_MB', 256))
+MAX_TENANTS = int(os.environ.get('CAREER_MAX_TENANTS', 16))
+
+TENANT_NAME = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def load_tenant_config(path=TENANT_CONFIG_PATH, artifact_root=None):
+    """Read the tenant list, returning {name: {'catalog': path, 'training_data': path, ...}}"""
+    if not path or not os.path.exists(path):
+        return {}
+    raw = load_catalog_file(path) or {}
+    tenants = raw.get('tenants', raw) if isinstance(raw, dict) else None
+    if not isinstance(tenants, dict):
+        raise ValueError("Tenant config must map tenant names to settings")
+    base = os.path.dirname(os.path.abspath(path))
+    root = artifact_root or os.path.join(ARTIFACT_DIR, 'tenants')
+    config = {}
+    for name, spec in tenants.items():
+        if not TENANT_NAME.match(str(name)) or name == DEFAULT_TENANT:
+            raise ValueError(f"Invalid tenant name '{name}'")
+        if not isinstance(spec, dict) or 'catalog' not in spec:
+            raise ValueError(f"Missing catalog for tenant {name}")
+        artifact_dir = os.path.join(root, name)
+        config[name] = {
+            'catalog': os.path.join(base, spec['catalog']),
+            'training_data': (os.path.join(base, spec['training_data']) if spec.get('training_data')
+                              else os.path.join(artifact_dir, 'career_quiz_data.csv')),
+            'artifact_dir': artifact_dir,
+            # Generated sample data follows the catalog; supplied data is never touched
+            'generated_data': not spec.get('training_data'),
+        }
+    return config
+
+
+class TenantBundle:
+    """One tenant's compiled catalog and the model trained for that catalog version"""
+
+    def __init__(self, name, store, catalog, model, scaler, nbytes, load_seconds):
+        self.name = name
+        self.store = store
+        self.catalog = catalog
+        self.model = model
+        self.scaler = scaler
+        self.nbytes = nbytes
+        self.load_seconds = load_seconds
+
+    def is_current(self):
+        """False once the tenant's catalog file has been hot-reloaded"""
+        return self.store.get() is self.catalog
+
+
+class TenantRegistry:
+    """Bounded LRU of loaded tenants with per-tenant hit and latency metrics"""
+
+    def __init__(self, config=None, budget_mb=TENANT_CACHE_MB, max_tenants=MAX_TENANTS):
+        self.config = load_tenant_config() if config is None else config
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.max_tenants = max_tenants
+        self._lock = threading.Lock()
+        self._bundles = OrderedDict()
+        self._metrics = {}
+
+    def resolve(self, requested=None):
+        """The tenant to serve: the requested one if configured, else the deployment default"""
+        for name in (requested, SELECTED_TENANT):
+            if name and (name == DEFAULT_TENANT or name in self.config):
+                return name
+        return DEFAULT_TENANT
+
+    def _metric(self, name):
+        return self._metrics.setdefault(name, {'hits': 0, 'misses': 0, 'loads': 0, 'evictions': 0,
+                                               'load_seconds': 0.0, 'last_load_seconds': None})
+
+    def request(self, name):
+        """Return a tenant's bundle for one page request, counting a hit or a miss"""
+        with self._lock:
+            resident = name in self._bundles
+        bundle = self.get(name)
+        with self._lock:
+            self._metric(name)['hits' if resident else 'misses'] += 1
+        return bundle
+
+    def get(self, name):
+        """Return a tenant's bundle, loading it if absent or its catalog changed"""
+        if name not in self.config:
+            raise ValueError(f"Unknown tenant '{name}'. Available: {', '.join(self.config) or 'none'}")
+        with self._lock:
+            bundle = self._bundles.get(name)
+            if bundle is not None:
+                self._bundles.move_to_end(name)
+        if bundle is not None and bundle.is_current():
+            return bundle
+        return get_flight('tenant').do(name, lambda: self._load(name, bundle))
+
+    def _load(self, name, previous=None):
+        with self._lock:
+            bundle = self._bundles.get(name)
+        if bundle is not None and bundle.is_current():
+            return bundle
+        start = time.perf_counter()
+        spec = self.config[name]
+        os.makedirs(spec['artifact_dir'], exist_ok=True)
+        # Keep the existing store so a reload inherits its similarity index
+        store = previous.store if previous is not None else CatalogStore(spec['catalog'], artifact_dir=spec['artifact_dir'])
+        catalog = store.get()
+        manifest = read_manifest(spec['artifact_dir'])
+        if (spec.get('generated_data') and manifest is not None
+                and manifest.get('catalog_digest') != catalog.digest and os.path.exists(spec['training_data'])):
+            # Sample data generated for the previous careers
+            os.remove(spec['training_data'])
+        build_artifacts(spec['artifact_dir'], spec['training_data'], spec['catalog'], catalog=catalog)
+        model, scaler = read_model_artifact(spec['artifact_dir'])
+        # Memory-mapped model arrays are shared pages; count the artifact file as the upper bound
+        nbytes = deep_sizeof(catalog) + os.path.getsize(os.path.join(spec['artifact_dir'], MODEL_FILE))
+        seconds = time.perf_counter() - start
+        bundle = TenantBundle(name, store, catalog, model, scaler, nbytes, seconds)
+
+        with self._lock:
+            self._bundles[name] = bundle
+            self._bundles.move_to_end(name)
+            metric = self._metric(name)
+            metric['loads'] += 1
+            metric['load_seconds'] += seconds
+            metric['last_load_seconds'] = seconds
+            self._evict()
+        return bundle
+
+    def _evict(self):
+        # Always keep the most recently used tenant, even if it alone exceeds the budget
+        while len(self._bundles) > 1 and (len(self._bundles) > self.max_tenants
+                                          or self.resident_bytes() > self.budget_bytes):
+            name, _ = self._bundles.popitem(last=False)
+            self._metrics[name]['evictions'] += 1
+
+    def resident_bytes(self):
+        return sum(bundle.nbytes for bundle in self._bundles.values())
+
+    def stats(self):
+        """Per-tenant hit rate, load latency, evictions and resident bytes"""
+        with self._lock:
+            tenants = {}
+            for name, metric in self._metrics.items():
+                lookups = metric['hits'] + metric['misses']
+                bundle = self._bundles.get(name)
+                tenants[name] = dict(
+                    metric,
+                    hit_rate=metric['hits'] / lookups if lookups else None,
+                    avg_load_seconds=metric['load_seconds'] / metric['loads'] if metric['loads'] else None,
+                    resident=bundle is not None,
+                    bytes=bundle.nbytes if bundle is not None else 0,
+                )
+            return {'tenants': tenants, 'resident_bytes': self.resident_bytes(),
+                    'budget_bytes': self.budget_bytes}
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_tenant_registry():
+    """Return the process-wide tenant registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = TenantRegistry()
+        return _registry
+
+
+def tenant_results_path(tenant=None):
+    """The results file a tenant's sessions save to"""
+    if tenant in (None, DEFAULT_TENANT):
+        return 'results.csv'
+    return f'results_{tenant}.csv'
+
+
+def get_tenant_catalog(tenant=None):
+    """The compiled catalog for a tenant (the default deployment catalog if None)"""
+    if tenant in (None, DEFAULT_TENANT):
+        return get_catalog()
+    return get_tenant_registry().get(tenant).catalog
@@ -14,6 +14,8 @@ import pandas as pd
 import numpy as np
 from app import CareerGuidanceSystem, CAREER_DATABASE, QUIZ_QUESTIONS
 import json
+import os
+import tempfile
 
 def test_career_database():
     """Test career database integrity"""
@@ -52,6 +54,195 @@ def test_quiz_questions():
     print(f"✅ Validated {len(QUIZ_QUESTIONS)} quiz questions")
     print(f"📊 Trait coverage: {len(trait_counts)} unique traits")
 
+def test_catalog_loading():
+    """Test external catalog compilation and hot reload"""
+    print("🧪 Testing Catalog Loading...")
+    
+    from catalog import CatalogStore, load_catalog_file, DEFAULT_CATALOG_PATH
+    
+    data = load_catalog_file(DEFAULT_CATALOG_PATH)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'catalog.json')
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        store = CatalogStore(path, check_interval=0)
+        catalog = store.get()
+        assert catalog is store.get(), "Catalog recompiled without a file change"
+        assert catalog.levels.shape == (len(data['careers']), len(data['quiz_questions'])), "Bad trait matrix shape"
+        assert catalog.career_index['Data Scientist'] == list(data['careers']).index('Data Scientist'), "Bad career index"
+        
+        # Editing the file hot-swaps a new compiled catalog
+        data['careers']['Data Scientist']['salary_range'] = "$1 - $2"
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+        reloaded = store.get()
+        assert reloaded is not catalog, "Catalog change not picked up"
+        assert reloaded.display['Data Scientist']['salary_range'] == "$1 - $2", "Stale display metadata"
+        
+        # An invalid edit keeps the last good catalog
+        data['careers']['Data Scientist']['required_traits']['math'] = 7
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 2 * 10**9))
+        assert store.get() is reloaded, "Invalid catalog was swapped in"
+        assert store.last_error is not None, "Validation error not recorded"
+        
+        # Malformed entries and unparseable files are rejected the same way
+        data['careers']['Data Scientist']['required_traits']['math'] = True
+        data['careers']['Broken Career'] = "not a mapping"
+        for i, content in enumerate([json.dumps(data), '{"careers": ']):
+            with open(path, 'w') as f:
+                f.write(content)
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + (3 + i) * 10**9))
+            assert store.get() is reloaded, "Malformed catalog was swapped in"
+    
+    print(f"✅ Catalog compiled with {len(catalog.career_names)} careers x {len(catalog.traits)} traits")
+
+def test_career_similarity():
+    """Test related-career lookups and incremental similarity rebuilds"""
+    print("🧪 Testing Career Similarity...")
+    
+    from catalog import CatalogStore, load_catalog_file, DEFAULT_CATALOG_PATH
+    from similarity import CareerSimilarity
+    
+    data = load_catalog_file(DEFAULT_CATALOG_PATH)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'catalog.json')
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        store = CatalogStore(path, check_interval=0)
+        similarity = store.get().similarity
+        related = similarity.related('Software Engineer', k=3)
+        assert len(related) == 3 and 'Software Engineer' not in dict(related), "Bad related careers"
+        assert related[0][0] == 'Data Scientist', "Closest career should share traits and tools"
+        assert all(a[1] >= b[1] for a, b in zip(related, related[1:])), "Related careers not ranked"
+        
+        # Editing one career patches the index instead of rebuilding it
+        data['careers']['Sales Representative']['tools'] = ["Python", "SQL", "Git"]
+        data['careers']['Sales Representative']['required_traits'] = {"math": 0.8, "logical_thinking": 0.9, "tech_affinity": 0.9}
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+        reloaded = store.get()
+        assert reloaded.similarity is not similarity, "Similarity index shared across catalog versions"
+        assert reloaded.similarity.row_updates < len(data['careers']), "Index recomputed from scratch"
+        
+        fresh = CareerSimilarity(data['careers'], reloaded.traits)
+        for name in data['careers']:
+            expected = [round(s, 4) for _, s in fresh.related(name, k=5)]
+            assert [round(s, 4) for _, s in reloaded.similarity.related(name, k=5)] == expected, f"Stale neighbours for {name}"
+        assert 'Sales Representative' in dict(reloaded.similarity.related('Software Engineer', k=2)), "Edit not reflected"
+    
+    print("✅ Career similarity working correctly")
+
+def test_career_search():
+    """Test BM25 career search on the real and a large synthetic catalog"""
+    print("🧪 Testing Career Search...")
+    
+    from catalog import get_catalog
+    from search import CareerSearchIndex, synthetic_careers
+    
+    index = get_catalog().search_index
+    assert index.search("figma")[0][0] == "UX/UI Designer", "Tool search failed"
+    assert index.search("therapy counseling")[0][0] == "Counselor/Therapist", "Multi-word search failed"
+    assert index.search("tablea")[0][0] == "Business Analyst", "Prefix search failed"
+    assert index.search("the") == [] and index.search("qwertyuiop") == [], "Unmatched query returned results"
+    results = index.search("data", k=3)
+    assert len(results) <= 3 and all(a[1] >= b[1] for a, b in zip(results, results[1:])), "Results not ranked"
+    
+    # Timing lives in `python search.py`; here only the ranking is checked
+    synthetic = synthetic_careers(CAREER_DATABASE, 2000)
+    large = CareerSearchIndex(synthetic)
+    name = list(synthetic)[1234]
+    assert large.search(name)[0][0] == name, "Exact name not ranked first in a large catalog"
+    
+    print(f"✅ Career search working correctly ({len(large.vocabulary)} terms at 2k careers)")
+
+def test_tenant_catalogs():
+    """Test per-tenant catalogs, models and LRU eviction"""
+    print("🧪 Testing Tenant Catalogs...")
+    
+    from catalog import get_catalog, load_catalog_file, DEFAULT_CATALOG_PATH
+    from tenants import TenantRegistry, get_tenant_catalog, load_tenant_config
+    
+    data = load_catalog_file(DEFAULT_CATALOG_PATH)
+    names = list(data['careers'])
+    with tempfile.TemporaryDirectory() as tmp:
+        tenants = {}
+        for i, tenant in enumerate(['north', 'south', 'east']):
+            catalog = dict(data, careers={n: data['careers'][n] for n in names[i:i + 4]})
+            with open(os.path.join(tmp, f'{tenant}.json'), 'w') as f:
+                json.dump(catalog, f)
+            tenants[tenant] = {'catalog': f'{tenant}.json'}
+        config_path = os.path.join(tmp, 'tenants.json')
+        with open(config_path, 'w') as f:
+            json.dump({'tenants': tenants}, f)
+        
+        registry = TenantRegistry(load_tenant_config(config_path, artifact_root=os.path.join(tmp, 'artifacts')),
+                                  max_tenants=2)
+        assert registry.resolve('south') == 'south' and registry.resolve('nowhere') == 'default', "Bad tenant resolution"
+        north = registry.request('north')
+        assert north.catalog.career_names == names[0:4] and north.catalog.levels.shape == (4, len(data['quiz_questions'])), "Wrong tenant matrix"
+        assert set(north.model.classes_) == set(names[0:4]), "Tenant model trained on the wrong careers"
+        assert registry.request('north') is north, "Resident tenant reloaded"
+        assert registry.request('south').catalog.career_names == names[1:5], "Tenants share a catalog"
+        
+        # A third tenant evicts the least recently used one, which reloads from its artifacts
+        import weakref
+        south_model = weakref.ref(registry.get('south').model)
+        registry.request('north')
+        registry.request('east')
+        stats = registry.stats()['tenants']
+        assert not stats['south']['resident'] and stats['south']['evictions'] == 1, "LRU tenant not evicted"
+        assert south_model() is None, "Evicted tenant's model still in memory"
+        reloaded = registry.request('south')
+        assert isinstance(reloaded.catalog.levels, np.memmap), "Reloaded tenant not using its artifact"
+        # Plain lookups within a request are not counted
+        for _ in range(5):
+            registry.get('north')
+        stats = registry.stats()['tenants']
+        assert stats['north']['hit_rate'] == 2 / 3 and stats['south']['loads'] == 2, "Hit rates not tracked"
+        assert stats['south']['avg_load_seconds'] > 0, "Load latency not tracked"
+        
+        # Editing a tenant's catalog retrains its model and re-measures it
+        catalog_path = os.path.join(tmp, 'south.json')
+        edited = dict(data, careers={n: data['careers'][n] for n in names[1:7]})
+        with open(catalog_path, 'w') as f:
+            json.dump(edited, f)
+        os.utime(catalog_path, ns=(0, os.stat(catalog_path).st_mtime_ns + 10**9))
+        reloaded.store.check_interval = 0
+        updated = registry.get('south')
+        assert updated is not reloaded and updated.catalog.career_names == names[1:7], "Catalog edit not picked up"
+        assert set(updated.model.classes_) == set(names[1:7]), "Model not retrained for the edited catalog"
+        assert updated.nbytes != reloaded.nbytes, "Tenant size not re-measured"
+        
+        # Renaming a trait retrains on the tenant's own traits
+        renamed = json.loads(json.dumps(edited).replace('"patience"', '"resilience"'))
+        with open(catalog_path, 'w') as f:
+            json.dump(renamed, f)
+        os.utime(catalog_path, ns=(0, os.stat(catalog_path).st_mtime_ns + 2 * 10**9))
+        resilient = registry.get('south')
+        assert 'resilience' in resilient.catalog.traits, "Trait rename not picked up"
+        assert list(resilient.scaler.feature_names_in_) == resilient.catalog.traits, "Model not trained on the tenant's traits"
+        answers = pd.DataFrame([[3] * len(resilient.catalog.traits)], columns=resilient.catalog.traits)
+        assert resilient.model.predict(resilient.scaler.transform(answers))[0] in names[1:7], "Renamed-trait model cannot predict"
+        
+        registry.budget_bytes = 1
+        registry.get(next(n for n, t in registry.stats()['tenants'].items() if not t['resident']))
+        assert len([t for t in registry.stats()['tenants'].values() if t['resident']]) == 1, "Memory budget ignored"
+        
+        try:
+            registry.get('nowhere')
+            assert False, "Unknown tenant accepted"
+        except ValueError:
+            pass
+    assert get_tenant_catalog(None) is get_catalog(), "Default tenant not the deployment catalog"
+    
+    print("✅ Tenant catalogs working correctly")
+
 def test_guidance_system():
     """Test the main guidance system"""
     print("🧪 Testing Guidance System...")
@@ -68,6 +259,235 @@ def test_guidance_system():
     
     print("✅ System initialization successful")
 
+def test_shared_artifacts():
+    """Test the shared on-disk model and catalog artifacts"""
+    print("🧪 Testing Shared Artifacts...")
+    
+    from artifacts import build_artifacts, load_model_artifact, load_catalog_arrays
+    from catalog import get_catalog
+    from run import StickyProxy
+    
+    catalog = get_catalog()
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, 'career_quiz_data.csv')
+        manifest = build_artifacts(artifact_dir=tmp, data_path=data_path)
+        assert manifest['built'], "Artifacts not built"
+        assert not build_artifacts(artifact_dir=tmp, data_path=data_path)['built'], "Current artifacts rebuilt"
+        
+        model, scaler = load_model_artifact(data_path=data_path, artifact_dir=tmp)
+        assert load_model_artifact(data_path=data_path, artifact_dir=tmp)[0] is model, "Model not shared in-process"
+        features = pd.read_csv(data_path).drop(columns='career').head(5)
+        assert len(model.predict(scaler.transform(features))) == 5, "Shared model cannot predict"
+        
+        levels, mask = load_catalog_arrays(manifest['catalog_digest'], catalog.career_names, catalog.traits, artifact_dir=tmp)
+        assert isinstance(levels, np.memmap), "Catalog matrix not memory-mapped"
+        assert np.array_equal(levels, catalog.levels) and np.array_equal(mask, catalog.mask), "Catalog artifact differs"
+        
+        # Stale data must not reuse the old model
+        pd.read_csv(data_path).head(50).to_csv(data_path, index=False)
+        assert load_model_artifact(data_path=data_path, artifact_dir=tmp) is None, "Stale model artifact used"
+    
+    proxy = StickyProxy([9001, 9002])
+    assert proxy.choose_worker("") == (0, True) and proxy.choose_worker("") == (1, True), "Not round-robin"
+    assert proxy.choose_worker("a=b; career_worker=1") == (1, False), "Session not sticky"
+    proxy.healthy[1] = False
+    assert proxy.choose_worker("career_worker=1") == (0, True), "Unhealthy worker still routed"
+    
+    print("✅ Shared artifacts working correctly")
+
+def test_streaming_training():
+    """Test out-of-core training on a chunked dataset"""
+    print("🧪 Testing Streaming Training...")
+    
+    from training import FEATURES, iter_training_chunks, train_from_path, write_synthetic_data
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_data(CAREER_DATABASE, os.path.join(tmp, 'train.csv'), 20000, chunksize=3000)
+        test = pd.read_csv(write_synthetic_data(CAREER_DATABASE, os.path.join(tmp, 'test.csv'), 2000, seed=1))
+        assert max(len(y) for _, y in iter_training_chunks(path, 3000)) == 3000, "Chunks exceed the chunk size"
+        
+        model, scaler, rows = train_from_path(CAREER_DATABASE, path, mode='streaming', chunksize=3000)
+        assert rows == 20000, "Streaming scaler did not see every row"
+        df = pd.read_csv(path)
+        assert np.allclose(scaler.mean_, df[FEATURES].mean().values), "Streaming scaler statistics differ"
+        accuracy = (model.predict(scaler.transform(test[FEATURES])) == test['career']).mean()
+        assert accuracy > 0.7, f"Streaming model accuracy too low: {accuracy:.2f}"
+        assert model.predict_proba(scaler.transform(test[FEATURES][:1])).shape == (1, len(CAREER_DATABASE)), "Bad probabilities"
+        
+        try:
+            train_from_path(CAREER_DATABASE, path, mode='gpu')
+            assert False, "Unknown training mode accepted"
+        except ValueError:
+            pass
+    
+    print(f"✅ Streaming training working correctly (accuracy {accuracy:.2f})")
+
+def test_warm_start():
+    """Test the launcher's warm-start phases"""
+    print("🧪 Testing Warm Start...")
+    
+    from run import PhaseTimer, serve_command, warm_server_process
+    
+    timer = PhaseTimer()
+    warm_server_process(timer)
+    phases = [name for name, _ in timer.phases]
+    assert phases == ["UI stack imports", "Catalog + model load", "Chart warm-up"], "Unexpected warm-up phases"
+    assert all(seconds >= 0 for _, seconds in timer.phases), "Invalid phase timing"
+    assert "--serve" in serve_command(8502), "Warm workers must run through the launcher"
+    assert "streamlit" in serve_command(8502, warm=False), "Cold workers must run streamlit directly"
+    
+    print("✅ Warm start working correctly")
+
+def test_single_flight():
+    """Test coalescing of concurrent expensive loads"""
+    print("🧪 Testing Single-Flight Loads...")
+    
+    import threading
+    import time
+    from singleflight import SingleFlight, flight_stats
+    from training import ensure_training_data, get_training_data
+    
+    flight = SingleFlight('test')
+    calls = []
+    
+    def slow_load():
+        calls.append(1)
+        time.sleep(0.2)
+        return object()
+    
+    def run_all(fn, n=8, timeout=None):
+        results = [None] * n
+        def worker(i):
+            try:
+                results[i] = flight.do('key', fn, timeout=timeout)
+            except Exception as e:
+                results[i] = e
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+            time.sleep(0.005)
+        for t in threads:
+            t.join()
+        return results
+    
+    results = run_all(slow_load)
+    assert len(calls) == 1 and all(r is results[0] for r in results), "Concurrent callers did not share one load"
+    assert flight.stats()['executions'] == 1 and flight.stats()['coalesced'] == 7, "Coalesced calls not counted"
+    
+    def failing_load():
+        time.sleep(0.1)
+        raise ValueError("bad data")
+    results = run_all(failing_load, n=3)
+    assert all(isinstance(r, ValueError) for r in results) and flight.stats()['errors'] == 1, "Error not propagated"
+    
+    results = run_all(slow_load, n=2, timeout=0.01)
+    assert isinstance(results[1], TimeoutError) and flight.stats()['timeouts'] == 1, "Waiter did not time out"
+    assert flight.stats()['in_flight'] == 0, "Finished call left in flight"
+    
+    # Sessions starting together read the training data once
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.csv')
+        ensure_training_data(CAREER_DATABASE, path)
+        before = flight_stats().get('training_data', {}).get('executions', 0)
+        frames = []
+        threads = [threading.Thread(target=lambda: frames.append(get_training_data(CAREER_DATABASE, path))) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert all(f is frames[0] for f in frames), "Sessions got different training data"
+        assert flight_stats()['training_data']['executions'] - before == 1, "Training data loaded more than once"
+    
+    print("✅ Single-flight loads working correctly")
+
+def test_session_eviction():
+    """Test idle session eviction and per-session memory accounting"""
+    print("🧪 Testing Session Eviction...")
+    
+    import time
+    from sessions import SessionRegistry
+    
+    registry = SessionRegistry(ttl=60, sweep_interval=3600)
+    builds = []
+    
+    def factory():
+        system = CareerGuidanceSystem()
+        system.train_ml_model()
+        registry.mark_shared(system.df, system.ml_model, system.scaler)
+        builds.append(system)
+        return system
+    
+    first = registry.get('a', 'guidance_system', factory)
+    second = registry.get('b', 'guidance_system', factory)
+    assert first.df is second.df and first.ml_model is second.ml_model, "Sessions do not share data and model"
+    registry.touch('a', {'current_step': 'results', 'user_info': {'name': 'A'}, 'score_tuple': (('math', 4),)})
+    
+    stats = registry.stats()
+    assert stats['sessions']['a']['compact_bytes'] > 0, "Compact state not measured"
+    assert stats['sessions']['a']['heavy_bytes'] < first.df.memory_usage(deep=True).sum(), "Shared data counted per session"
+    
+    # Only the idle session loses its heavy objects, and it rebuilds on return
+    registry.sweep(now=time.monotonic() + 30)
+    assert registry.stats()['active_sessions'] == 2, "Active session evicted early"
+    registry.touch('b')
+    registry._sessions['a']['last_seen'] -= 120
+    registry.sweep()
+    assert registry.stats()['active_sessions'] == 1 and registry.evictions == 1, "Idle session not evicted"
+    assert registry.get('a', 'guidance_system', factory) is not first, "Evicted session not rebuilt"
+    assert registry.rebuilds == 1 and len(builds) == 3, "Rebuild not counted"
+    
+    # Concurrent reruns of one session share a single build
+    import threading
+    def slow_factory():
+        time.sleep(0.2)
+        builds.append(object())
+        return builds[-1]
+    threads = [threading.Thread(target=registry.get, args=('c', 'guidance_system', slow_factory)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 4, "Concurrent reruns built the session more than once"
+    
+    # Shared objects are only weakly held
+    replaced = pd.DataFrame({'x': range(10)})
+    registry.mark_shared(replaced)
+    key = id(replaced)
+    assert key in registry._shared, "Shared object not recorded"
+    del replaced
+    assert key not in registry._shared, "Replaced shared object still pinned"
+    
+    print("✅ Session eviction working correctly")
+
+def test_rerun_profiling():
+    """Test the admin-only rerun profiling hook"""
+    print("🧪 Testing Rerun Profiling...")
+    
+    import profiling
+    
+    original = profiling.PROFILE_TOKEN
+    try:
+        profiling.PROFILE_TOKEN = None
+        assert not profiling.profiling_enabled() and not profiling.is_authorized('secret'), "Profiling on without a token"
+        profiling.PROFILE_TOKEN = 'secret'
+        assert profiling.is_authorized('secret'), "Admin token rejected"
+        assert not profiling.is_authorized('guess') and not profiling.is_authorized(None), "Wrong token accepted"
+    finally:
+        profiling.PROFILE_TOKEN = original
+    assert profiling.parse_top_n('40') == 40, "Row count not parsed"
+    assert profiling.parse_top_n('abc') == profiling.parse_top_n(None) == profiling.parse_top_n('-3') == 20, "Bad row count not defaulted"
+    
+    system = CareerGuidanceSystem()
+    scores = {q['trait']: 3 for q in QUIZ_QUESTIONS}
+    with tempfile.TemporaryDirectory() as tmp:
+        path, rows = profiling.profile_call(lambda: system.calculate_career_match(scores), 'quiz/results',
+                                            out_dir=tmp, top_n=5)
+        assert os.path.exists(path) and path.endswith('_quiz-results.prof'), "Profile not saved with step name"
+        assert 0 < len(rows) <= 5, "Top-N summary has the wrong size"
+        assert any('calculate_career_match' in row['function'] for row in rows), "Hot function missing from summary"
+    
+    print("✅ Rerun profiling working correctly")
+
 def test_career_matching():
     """Test career matching algorithm"""
     print("🧪 Testing Career Matching Algorithm...")
@@ -101,6 +521,92 @@ def test_career_matching():
     print(f"✅ Top recommendation for tech profile: {top_career}")
     assert top_career in ["Software Engineer", "Data Scientist"], "Unexpected recommendation for tech profile"
 
+def test_matching_kernels():
+    """Test vectorised matching kernels against the original rule"""
+    print("🧪 Testing Matching Kernels...")
+    
+    from matching import KERNELS, CareerMatcher, benchmark_kernels
+    
+    traits = [q['trait'] for q in QUIZ_QUESTIONS]
+    rng = np.random.default_rng(1)
+    
+    def legacy_match(user_scores):
+        career_scores = {}
+        for career, info in CAREER_DATABASE.items():
+            matches = [1 - abs(user_scores[t] / 5.0 - level)
+                       for t, level in info['required_traits'].items() if t in user_scores]
+            career_scores[career] = sum(matches) / len(matches) if matches else 0
+        return career_scores
+    
+    matcher = CareerMatcher(CAREER_DATABASE, traits, kernel='l1')
+    for _ in range(50):
+        answered = rng.choice(traits, size=rng.integers(1, len(traits) + 1), replace=False)
+        user_scores = {t: int(rng.integers(1, 6)) for t in answered}
+        expected = legacy_match(user_scores)
+        actual = matcher.score(user_scores)
+        assert list(actual) == list(expected), "Career order changed"
+        assert np.allclose(list(actual.values()), list(expected.values())), "l1 kernel differs from original rule"
+    
+    U = rng.integers(1, 6, size=(200, len(traits))) / 5.0
+    for name in KERNELS:
+        scores = CareerMatcher(CAREER_DATABASE, traits, kernel=name).score_batch(U)
+        assert scores.shape == (200, len(CAREER_DATABASE)), f"Bad output shape for {name}"
+        assert ((scores >= 0) & (scores <= 1)).all(), f"Scores out of range for {name}"
+    
+    report = benchmark_kernels(CAREER_DATABASE, traits, n_users=500)
+    assert report['l1']['top1_agreement'] == 1.0, "Reference kernel must agree with itself"
+    print(f"   Kernels: {', '.join(sorted(report))}")
+    print("✅ Matching kernels working correctly")
+
+def test_what_if_sensitivity():
+    """Test batched what-if analysis against one-at-a-time matching"""
+    print("🧪 Testing What-If Sensitivity...")
+    
+    system = CareerGuidanceSystem()
+    scores = {'math': 4, 'logical_thinking': 5, 'creativity': 3, 'tech_affinity': 5, 'empathy': 2,
+              'communication': 3, 'leadership': 3, 'analytical': 4, 'patience': 1, 'organization': 5}
+    report = system.what_if(scores)
+    
+    # Every in-range +/-1 change is covered: 20 minus the out-of-range ends
+    assert len(report['changes']) == 16, "Wrong number of perturbations"
+    for change in report['changes']:
+        perturbed = dict(scores, **{change['trait']: change['to']})
+        ranked = sorted(system.calculate_career_match(perturbed).items(), key=lambda x: x[1], reverse=True)
+        assert change['top_career'] == ranked[0][0], f"Wrong top career for {change['trait']} → {change['to']}"
+        assert change['alternatives'] == [c for c, _ in ranked[1:3]], "Wrong alternatives"
+        assert change['flips_top'] == (ranked[0][0] != report['top_career']), "Wrong flip flag"
+    
+    subset = system.what_if(scores, ['math', 'empathy'])
+    assert {c['trait'] for c in subset['changes']} == {'math', 'empathy'}, "Trait subset ignored"
+    assert system.what_if(scores, [])['changes'] == [], "Empty trait selection analysed every trait"
+    assert system.what_if(scores) is report, "What-if result not cached"
+    
+    flips = sum(c['flips_top'] for c in report['changes'])
+    print(f"   {flips} of {len(report['changes'])} single changes flip the top career")
+    print("✅ What-if sensitivity working correctly")
+
+def test_adaptive_quiz():
+    """Test adaptive quiz early stopping"""
+    print("🧪 Testing Adaptive Quiz...")
+    
+    from catalog import get_catalog
+    from adaptive_quiz import AdaptiveQuiz, simulate
+    
+    catalog = get_catalog()
+    quiz = AdaptiveQuiz(catalog, k=1)
+    lower, upper = quiz.bounds()
+    assert (lower <= upper).all(), "Invalid score bounds"
+    assert quiz.next_trait() in catalog.traits, "No first question chosen"
+    
+    # Early stopping must never change the top-k ranking of the full quiz
+    for k in (1, 3):
+        report = simulate(catalog, n_users=300, k=k)
+        assert report['ranking_mismatches'] == 0, f"Adaptive quiz changed the top-{k} ranking"
+        assert report['avg_questions'] <= len(catalog.traits), "Asked too many questions"
+        print(f"   top-{k}: {report['avg_questions']:.2f} questions on average")
+    
+    print("✅ Adaptive quiz working correctly")
+
 def test_personality_tags():
     """Test personality tag generation"""
     print("🧪 Testing Personality Tags...")
@@ -121,6 +627,69 @@ def test_personality_tags():
     
     print("✅ Personality tag generation working")
 
+def test_user_segments():
+    """Test streaming personality segments over saved results"""
+    print("🧪 Testing User Segments...")
+    
+    from replay import make_sample_results, replay_results
+    from segments import BATCH_SIZE, ResultsSegments, SegmentModel
+    
+    traits = [q['trait'] for q in QUIZ_QUESTIONS]
+    
+    # Well-separated groups streamed in small batches end up in one segment each
+    rng = np.random.default_rng(0)
+    blobs = np.array([[1] * 10, [5] * 10, [1, 5] * 5], dtype=float)
+    group = rng.integers(3, size=900)
+    points = blobs[group] + rng.normal(0, 0.2, size=(900, 10))
+    model = SegmentModel(traits, n_segments=3, min_results=0)
+    for start in range(0, len(points), 50):
+        model.partial_fit(points[start:start + 50])
+    assigned = model.assign_batch(points)
+    assert all(len(set(assigned[group == g])) == 1 for g in range(3)), "Groups split across segments"
+    assert len(set(assigned)) == 3, "Groups merged into one segment"
+    assert [model.assign(p) for p in points[:50]] == list(assigned[:50]), "Single and batch assignment differ"
+    assert model.sizes.sum() == model.n_fitted == 900 - 900 % BATCH_SIZE, "Segment sizes do not cover every fitted result"
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_sample_results(os.path.join(tmp, 'results.csv'), n_rows=600)
+        segments = ResultsSegments(path, traits, artifact_dir=tmp)
+        assert segments.model.ready and segments.model.n_seen == 600, "Results file not folded in"
+        answers = pd.read_csv(path)[traits].iloc[0].to_dict()
+        assert segments.tag(answers) in segments.model.labels, "Full answers not given a segment"
+        # Partial answers still get the dominant-trait tag
+        assert segments.tag({'creativity': 5, 'math': 2, 'empathy': 3}) == "Creative Thinker"
+        # Replay tags with the same segments the sample was written with
+        assert replay_results(path, workers=1, use_model=False)['tag_changed'] == 0, "Segment tags drifted"
+        
+        # Appended results update the centroids in place but keep each segment's name
+        before, labels = segments.model.centers.copy(), list(segments.model.labels)
+        pd.read_csv(path).head(BATCH_SIZE).to_csv(path, mode='a', header=False, index=False)
+        assert segments.refresh() == BATCH_SIZE and segments.model.n_seen == 600 + BATCH_SIZE, "Appended rows not picked up"
+        assert not np.allclose(before, segments.model.centers), "Centroids not updated"
+        assert segments.model.labels == labels, "Segment labels changed without a relabel"
+        
+        # Another process loads the shared artifact and sees a relabel
+        worker = ResultsSegments(path, traits, artifact_dir=tmp)
+        assert worker.model.n_seen == 600 + BATCH_SIZE and np.array_equal(worker.model.centers, segments.model.centers), "Artifact not shared"
+        assert len(segments.relabel()) == 8, "Relabel lost segments"
+        worker.refresh()
+        assert worker.model.labels == segments.model.labels, "Relabel not shared"
+        
+        # Segments depend only on the rows, not on how often the file was tailed
+        rows = pd.read_csv(path)
+        tailed_path = os.path.join(tmp, 'tailed.csv')
+        rows.head(0).to_csv(tailed_path, index=False)
+        tailed = ResultsSegments(tailed_path, traits, artifact_dir=tmp)
+        for start in range(0, len(rows), 7):
+            rows.iloc[start:start + 7].to_csv(tailed_path, mode='a', header=False, index=False)
+            tailed.refresh()
+        one_pass = ResultsSegments(path, traits, artifact_dir=os.path.join(tmp, 'fresh'))
+        assert np.array_equal(tailed.model.centers, one_pass.model.centers), "Centroids depend on append cadence"
+        answers = rows[traits].to_numpy(dtype=float)
+        assert (tailed.model.tag_batch(answers) == one_pass.model.tag_batch(answers)).all(), "Tags depend on append cadence"
+    
+    print(f"✅ User segments working ({len(set(segments.model.labels))} labelled segments)")
+
 def test_data_persistence():
     """Test data saving functionality"""
     print("🧪 Testing Data Persistence...")
@@ -167,8 +736,93 @@ def test_data_persistence():
     assert 'name' in results_df.columns, "Missing name column"
     assert 'recommended_career' in results_df.columns, "Missing career column"
     
+    # Questions skipped by the adaptive quiz are saved blank, not as neutral answers
+    system.save_results(user_info, career_result, test_scores, answered=('math', 'tech_affinity'))
+    last = pd.read_csv('results.csv').iloc[-1]
+    assert last['math'] == 4 and pd.isna(last['creativity']), "Unanswered traits not left blank"
+    
     print("✅ Data persistence working correctly")
 
+def test_results_index():
+    """Test nearest-neighbour lookup over saved results"""
+    print("🧪 Testing Similar Users Index...")
+    
+    from neighbors import ResultsIndex, TRAIT_COLUMNS
+    
+    rng = np.random.default_rng(0)
+    
+    def make_rows(n):
+        rows = pd.DataFrame(rng.integers(1, 6, size=(n, len(TRAIT_COLUMNS))), columns=TRAIT_COLUMNS)
+        rows.insert(0, 'recommended_career', rng.choice(list(CAREER_DATABASE), size=n))
+        return rows
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'results.csv')
+        rows = make_rows(500)
+        rows.to_csv(path, index=False)
+        index = ResultsIndex(path, rebuild_threshold=64)
+        assert len(index) == 500, "Failed to index existing results"
+        
+        # New rows are picked up incrementally from the file
+        extra = make_rows(40)
+        extra.to_csv(path, mode='a', header=False, index=False)
+        all_rows = pd.concat([rows, extra], ignore_index=True)
+        
+        query = {trait: 3 for trait in TRAIT_COLUMNS}
+        neighbours = index.query(query, k=7)
+        assert len(index) == 540, "Appended results not indexed"
+        assert len(neighbours) == 7, "Wrong number of neighbours"
+        
+        # Distances must match a brute-force scan
+        points = all_rows[TRAIT_COLUMNS].to_numpy(dtype=float)
+        brute = np.sort(np.sqrt(((points - 3) ** 2).sum(axis=1)))[:7]
+        assert np.allclose([n['distance'] for n in neighbours], brute), "Neighbours are not the nearest"
+        assert set(neighbours[0]) == {'recommended_career', 'distance'}, "Neighbours must not expose user details"
+        assert index.query(query, k=7) == neighbours, "Cached lookup changed"
+        
+        # Pending stays bounded and trees follow the doubling schedule
+        assert len(index._pending) < 64, "Pending buffer not capped"
+        sizes = [len(keys) for keys, _ in index._levels]
+        assert sizes == sorted(sizes, reverse=True) and len(set(sizes)) == len(sizes), "Levels not log-structured"
+        
+        # A new result invalidates cached lookups
+        make_rows(1).assign(**query).to_csv(path, mode='a', header=False, index=False)
+        assert index.query(query, k=7)[0]['distance'] == 0, "Cache not invalidated by new results"
+    
+    print("✅ Similar users index working correctly")
+
+def test_results_replay():
+    """Test replaying saved results against the current engine"""
+    print("🧪 Testing Results Replay...")
+    
+    from replay import make_sample_results, replay_results
+    
+    system = CareerGuidanceSystem()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_sample_results(os.path.join(tmp, 'results.csv'), n_rows=300)
+        df = pd.read_csv(path)
+        
+        # Tamper with a few saved rows so the replay has something to find
+        for row in (3, 50, 299):
+            scores = system.calculate_career_match({q['trait']: int(df.loc[row, q['trait']]) for q in QUIZ_QUESTIONS})
+            df.loc[row, 'recommended_career'] = min(scores, key=scores.get)
+        df.loc[[10, 20], 'personality_tag'] = "Outdated Tag"
+        df.loc[30, 'math'] = None
+        df.to_csv(path, index=False)
+        
+        diff_path = os.path.join(tmp, 'diff.csv')
+        stats = replay_results(path, workers=2, chunk_size=64, diff_path=diff_path)
+        assert stats['rows'] == 299 and stats['skipped'] == 1, "Incomplete rows not skipped"
+        assert stats['career_changed'] == 3 and stats['tag_changed'] == 2, "Wrong disagreement counts"
+        assert stats['confidence_changed'] == 0, "Unchanged confidence reported as changed"
+        assert 0 <= stats['ml_disagreement_rate'] <= 1 and stats['rows_per_sec'] > 0, "Missing model or throughput stats"
+        assert sorted(pd.read_csv(diff_path)['row']) == [3, 10, 20, 50, 299], "Diff rows do not match"
+        
+        # A different kernel re-ranks some results
+        assert replay_results(path, kernel='l2', workers=1, use_model=False)['career_changed'] > 3, "Kernel change not detected"
+    
+    print(f"✅ Results replay working correctly ({stats['rows_per_sec']:.0f} rows/sec)")
+
 def test_sample_user_journey():
     """Simulate a complete user journey"""
     print("🧪 Testing Complete User Journey...")
@@ -226,6 +880,35 @@ def test_sample_user_journey():
     
     print("✅ Complete user journey successful")
 
+def test_cohort_reports():
+    """Test batch report generation for a cohort"""
+    print("🧪 Testing Cohort Reports...")
+    
+    from cohort_report import generate_cohort_reports, make_sample_cohort
+    
+    system = CareerGuidanceSystem()
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = make_sample_cohort(os.path.join(tmp, 'cohort.csv'), n_students=50)
+        out_dir = os.path.join(tmp, 'reports')
+        stats = generate_cohort_reports(csv_path, out_dir, workers=2, chunk_size=10)
+        
+        assert stats['students'] == 50, "Not every student got a report"
+        reports = [f for f in os.listdir(out_dir) if f.endswith('.html') and f != 'index.html']
+        assert len(reports) == 50, "Missing report files"
+        assert os.path.exists(stats['summary_path']), "Cohort summary not written"
+        
+        # Reports must agree with the interactive app's recommendation
+        summary = pd.read_csv(os.path.join(out_dir, 'cohort_summary.csv'))
+        student = pd.read_csv(csv_path).iloc[7]
+        scores = {q['trait']: int(student[q['trait']]) for q in QUIZ_QUESTIONS}
+        ranked = sorted(system.calculate_career_match(scores).items(), key=lambda x: x[1], reverse=True)
+        assert summary.iloc[7]['top_career'] == ranked[0][0], "Report disagrees with the app"
+        with open(os.path.join(out_dir, summary.iloc[7]['file']), encoding='utf-8') as f:
+            page = f.read()
+        assert '<svg' in page and ranked[0][0] in page, "Report missing radar or career details"
+    
+    print(f"✅ Generated {stats['students']} cohort reports ({stats['reports_per_sec']:.0f}/sec)")
+
 def generate_test_report():
     """Generate a comprehensive test report"""
     print("\n📋 Test Report Generation...")
@@ -262,11 +945,28 @@ def main():
         # Core functionality tests
         test_career_database()
         test_quiz_questions()
+        test_catalog_loading()
+        test_career_similarity()
+        test_career_search()
+        test_tenant_catalogs()
         test_guidance_system()
+        test_shared_artifacts()
+        test_streaming_training()
+        test_warm_start()
+        test_single_flight()
+        test_session_eviction()
+        test_rerun_profiling()
         test_career_matching()
+        test_matching_kernels()
+        test_what_if_sensitivity()
+        test_adaptive_quiz()
         test_personality_tags()
+        test_user_segments()
         test_data_persistence()
+        test_results_index()
+        test_results_replay()
         test_sample_user_journey()
+        test_cohort_reports()
         
         # Generate report
         generate_test_report()
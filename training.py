@@ -0,0 +1,328 @@
+"""
+AI Career Guidance System - Training Data and Model
+===================================================
+
+Loads (or generates) the career quiz training dataset and fits the career
+prediction model. Kept free of Streamlit so the launcher can build the shared
+model artifact before any worker starts.
+
+Set ``CAREER_TRAINING_MODE=streaming`` for datasets larger than memory: the
+CSV is read in ``CAREER_TRAINING_CHUNK`` row chunks, the scaler is fitted in
+one streaming pass and a mini-batch SGD classifier is trained chunk by chunk,
+so peak memory depends on the chunk size rather than the dataset size. Each
+scaled trait is paired with its square, which lets the linear model capture
+how tightly a career's answers cluster around its required level.
+
+Data is generated for, and models are trained on, the traits of the catalog
+being served (``traits=catalog.traits``); ``FEATURES`` is only the default
+for callers that pass none.
+
+Usage:
+    python training.py --benchmark --rows 500000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from singleflight import get_flight
+
+# Traits of the bundled catalog, used when a caller passes no traits
+FEATURES = ["math", "logical_thinking", "creativity", "tech_affinity",
+            "empathy", "communication", "leadership", "analytical",
+            "patience", "organization"]
+
+DATA_PATH = 'career_quiz_data.csv'
+TRAINING_MODE = os.environ.get('CAREER_TRAINING_MODE', 'memory')
+CHUNK_SIZE = int(os.environ.get('CAREER_TRAINING_CHUNK', 50000))
+STREAMING_EPOCHS = 5
+BATCH_SIZE = 5000
+
+_data_cache = {}
+_model_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _features(traits):
+    return list(traits or FEATURES)
+
+
+def _check_columns(columns, traits, path):
+    missing = [t for t in traits if t not in columns]
+    if missing:
+        raise ValueError(f"Training data {path} has no column for trait(s): {', '.join(missing)}")
+
+
+def generate_sample_data(career_database, n_records=100, traits=None):
+    """Create a sample dataset with scores drawn around each career's requirements"""
+    traits = _features(traits)
+    sample_data = []
+    careers = list(career_database.keys())
+
+    for _ in range(n_records):
+        record = {}
+        career = np.random.choice(careers)
+        career_traits = career_database[career]["required_traits"]
+
+        # Generate scores based on career requirements with some noise
+        for trait in traits:
+            if trait in career_traits:
+                base_score = career_traits[trait]
+                record[trait] = max(1, min(5, np.random.normal(base_score * 5, 0.5)))
+            else:
+                record[trait] = np.random.uniform(1, 5)
+
+        record['career'] = career
+        sample_data.append(record)
+
+    return pd.DataFrame(sample_data)
+
+
+def load_or_create_training_data(career_database, path=DATA_PATH, traits=None):
+    """Load existing data or create and save a sample dataset"""
+    try:
+        return pd.read_csv(path)
+    except FileNotFoundError:
+        df = generate_sample_data(career_database, traits=traits)
+        df.to_csv(path, index=False)
+        return df
+
+
+def ensure_training_data(career_database, path=DATA_PATH, traits=None):
+    """Create the sample dataset if missing, without reading an existing one"""
+    if not os.path.exists(path):
+        generate_sample_data(career_database, traits=traits).to_csv(path, index=False)
+
+
+def write_synthetic_data(career_database, path, n_rows, chunksize=CHUNK_SIZE, seed=0, traits=None):
+    """Write n_rows of sample data chunk by chunk (vectorised, for benchmarks)"""
+    traits = _features(traits)
+    rng = np.random.default_rng(seed)
+    careers = np.array(list(career_database))
+    base = np.array([[career_database[c]["required_traits"].get(t, np.nan) * 5 for t in traits]
+                     for c in careers])
+    for start in range(0, n_rows, chunksize):
+        n = min(chunksize, n_rows - start)
+        idx = rng.integers(len(careers), size=n)
+        levels = base[idx]
+        noisy = np.clip(rng.normal(np.nan_to_num(levels), 0.5), 1, 5)
+        X = np.where(np.isnan(levels), rng.uniform(1, 5, levels.shape), noisy)
+        chunk = pd.DataFrame(X, columns=traits)
+        chunk['career'] = careers[idx]
+        chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+    return path
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def get_training_data(career_database, path=DATA_PATH, traits=None):
+    """Process-wide training data, reloaded only when the file changes"""
+    key = os.path.abspath(path)
+    signature = _signature(path)
+    cached = _data_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    def load():
+        # A caller that saw the file before it was created may arrive after it was loaded
+        cached = _data_cache.get(key)
+        if cached is not None and cached[0] == _signature(path):
+            return cached[1]
+        df = load_or_create_training_data(career_database, path, traits)
+        with _cache_lock:
+            _data_cache[key] = (_signature(path), df)
+        return df
+
+    # Concurrent sessions share one read instead of each parsing the file
+    return get_flight('training_data').do((key, signature), load)
+
+
+def _cache_model(key, owner, fit):
+    def run():
+        result = fit()
+        with _cache_lock:
+            _model_cache.clear()
+            _model_cache[key] = (owner, result)
+        return result
+    return get_flight('model').do(key, run)
+
+
+def get_trained_model(df, traits=None):
+    """Fit once per training DataFrame and share the result across sessions"""
+    key = (id(df), tuple(_features(traits)))
+    cached = _model_cache.get(key)
+    if cached is not None and cached[0] is df:
+        return cached[1]
+    return _cache_model(key, df, lambda: train_model(df, traits))
+
+
+def get_streamed_model(path=DATA_PATH, chunksize=CHUNK_SIZE, traits=None):
+    """Streaming-trained (model, scaler), refitted only when the file changes"""
+    key = (os.path.abspath(path), _signature(path), tuple(_features(traits)))
+    cached = _model_cache.get(key)
+    if cached is not None:
+        return cached[1]
+    return _cache_model(key, path, lambda: train_model_streaming(path, chunksize, traits=traits))
+
+
+def train_model(df, traits=None):
+    """Fit the scaler and random forest, returning (model, scaler)"""
+    X = df[_features(traits)]
+    y = df['career']
+
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+
+    model = RandomForestClassifier(n_estimators=100, random_state=42)
+    model.fit(X_scaled, y)
+    return model, scaler
+
+
+def iter_training_chunks(path=DATA_PATH, chunksize=CHUNK_SIZE, traits=None):
+    """Yield (X, y) for successive chunks of the training CSV"""
+    traits = _features(traits)
+    _check_columns(pd.read_csv(path, nrows=0).columns, traits, path)
+    for chunk in pd.read_csv(path, usecols=traits + ['career'], chunksize=chunksize):
+        yield chunk[traits].astype(np.float64), chunk['career'].to_numpy()
+
+
+class StreamingClassifier:
+    """SGD logistic regression on scaled traits and their squares"""
+
+    def __init__(self, alpha=1e-4, random_state=42):
+        self.sgd = SGDClassifier(loss='log_loss', alpha=alpha, random_state=random_state)
+
+    @staticmethod
+    def _expand(X):
+        X = np.asarray(X, dtype=np.float64)
+        return np.hstack([X, X ** 2])
+
+    @property
+    def classes_(self):
+        return self.sgd.classes_
+
+    def partial_fit(self, X, y, classes=None):
+        self.sgd.partial_fit(self._expand(X), y, classes=classes)
+        return self
+
+    def predict(self, X):
+        return self.sgd.predict(self._expand(X))
+
+    def predict_proba(self, X):
+        return self.sgd.predict_proba(self._expand(X))
+
+
+def train_model_streaming(path=DATA_PATH, chunksize=CHUNK_SIZE, epochs=STREAMING_EPOCHS, traits=None):
+    """Fit the scaler and a mini-batch classifier chunk by chunk, returning (model, scaler)"""
+    # Pass 1: scaler statistics and the set of classes
+    scaler = StandardScaler()
+    classes = set()
+    for X, y in iter_training_chunks(path, chunksize, traits):
+        scaler.partial_fit(X)
+        classes.update(y)
+    classes = np.array(sorted(classes))
+
+    # Remaining passes: shuffled mini-batches within each chunk
+    model = StreamingClassifier()
+    rng = np.random.default_rng(42)
+    for _ in range(epochs):
+        for X, y in iter_training_chunks(path, chunksize, traits):
+            order = rng.permutation(len(y))
+            X, y = scaler.transform(X.iloc[order]), y[order]
+            for start in range(0, len(y), BATCH_SIZE):
+                model.partial_fit(X[start:start + BATCH_SIZE], y[start:start + BATCH_SIZE], classes=classes)
+    return model, scaler
+
+
+def train_from_path(career_database, path=DATA_PATH, mode=None, chunksize=CHUNK_SIZE, traits=None):
+    """Train in the configured mode, returning (model, scaler, training_rows)"""
+    mode = mode or TRAINING_MODE
+    if mode == 'streaming':
+        ensure_training_data(career_database, path, traits)
+        model, scaler = train_model_streaming(path, chunksize, traits=traits)
+        return model, scaler, int(scaler.n_samples_seen_)
+    if mode != 'memory':
+        raise ValueError(f"Unknown training mode '{mode}'. Available: memory, streaming")
+    df = load_or_create_training_data(career_database, path, traits)
+    _check_columns(df.columns, _features(traits), path)
+    model, scaler = train_model(df, traits)
+    return model, scaler, len(df)
+
+
+def _peak_rss_mb():
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(mode, path, test_path, chunksize):
+    """Train once in this process and report accuracy, time and peak RSS"""
+    traits = [c for c in pd.read_csv(test_path, nrows=0).columns if c != 'career']
+    start_rss = _peak_rss_mb()
+    start = time.perf_counter()
+    model, scaler, rows = train_from_path({}, path, mode, chunksize, traits)
+    seconds = time.perf_counter() - start
+    test = pd.read_csv(test_path)
+    accuracy = float((model.predict(scaler.transform(test[traits])) == test['career']).mean())
+    return {'mode': mode, 'rows': rows, 'accuracy': accuracy, 'seconds': seconds,
+            'peak_rss_mb': _peak_rss_mb(), 'import_rss_mb': start_rss}
+
+
+def benchmark_training(career_database, n_rows, chunksize=CHUNK_SIZE, test_rows=20000, workdir=None, traits=None):
+    """Compare in-memory and streaming training, each in a fresh process"""
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        path = write_synthetic_data(career_database, os.path.join(tmp, 'train.csv'), n_rows, chunksize, 0, traits)
+        test_path = write_synthetic_data(career_database, os.path.join(tmp, 'test.csv'), test_rows, chunksize, 1, traits)
+        results = []
+        for mode in ('memory', 'streaming'):
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--measure', mode, path, test_path, str(chunksize)],
+                capture_output=True, text=True, check=True)
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark in-memory vs streaming model training")
+    parser.add_argument('--benchmark', action='store_true', help="run the training benchmark")
+    parser.add_argument('--rows', type=int, default=500000, help="synthetic training rows")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="rows per streamed chunk")
+    parser.add_argument('--measure', nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        mode, path, test_path, chunksize = args.measure
+        print(json.dumps(_measure(mode, path, test_path, int(chunksize))))
+        return
+    if not args.benchmark:
+        parser.print_help()
+        return
+
+    from catalog import get_catalog
+
+    catalog = get_catalog()
+    print(f"📊 Training on {args.rows:,} rows (chunks of {args.chunk_size:,})")
+    for result in benchmark_training(catalog.careers, args.rows, args.chunk_size, traits=catalog.traits):
+        print(f"  {result['mode']:<10} accuracy {result['accuracy']:.3f}  "
+              f"⏱️ {result['seconds']:6.1f}s  peak RSS {result['peak_rss_mb']:7.0f} MB "
+              f"(+{result['peak_rss_mb'] - result['import_rss_mb']:.0f} MB for training)")
+
+
+if __name__ == "__main__":
+    main()